@@ -1,3 +1,8 @@
+import time
+
+# 记录进程启动时刻，用于测量冷启动耗时
+STARTUP_BEGIN = time.perf_counter()
+
 from kivy.app import App
 from kivy.uix.screenmanager import ScreenManager, Screen
 from kivy.uix.gridlayout import GridLayout
@@ -5,42 +10,49 @@ from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.label import Label
 from kivy.uix.button import Button
 from kivy.uix.scrollview import ScrollView
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recyclegridlayout import RecycleGridLayout
 from kivy.uix.textinput import TextInput
 from kivy.uix.behaviors import ButtonBehavior
-from kivy.core.audio import SoundLoader
 from kivy.core.window import Window
-from kivy.core.text import LabelBase
 from kivy.graphics import Color, Rectangle, Line
 from kivy.uix.image import Image
 from kivy.uix.popup import Popup
 from kivy.uix.floatlayout import FloatLayout
 from kivy.clock import Clock
 from kivy.resources import resource_find
-import pandas as pd
-import random
+from kivy.metrics import sp
+from kivy.properties import ObjectProperty, StringProperty
 import os
-import difflib
+import gc
+import json
+import threading
+
+from applog import logger, report_error, debug_enabled, log_error_summary
+from fonts import register_fonts
+import instrument
+from journal import ProgressJournal
+from markup_cache import colored_texture, rgba_to_hex
+from quiz import QuizSession
+from scheduler import Scheduler
+from sound_cache import SoundCache, prefetch_file
+from sound_index import SoundIndex, SOUND_DIRS
+from spelling import SpellingIndex
+from sync_client import SyncClient
+from ui_images import image_source
+from wordbank import WordBank, COLUMNS
 
-# 注册系统字体以支持中文显示
 try:
-    # 尝试注册一些常见的中文字体
-    font_paths = [
-        'C:\Windows\Fonts\simsun.ttc',  # 宋体
-        'C:\Windows\Fonts\simhei.ttf',  # 黑体
-        'C:\Windows\Fonts\msyh.ttc',  # 微软雅黑
-        'C:\Windows\Fonts\times.ttf',  # Times New Roman - 支持音标
-        'C:\Windows\Fonts\arial.ttf',  # Arial - 支持音标
-        'C:\Windows\Fonts\cour.ttf'  # Courier New - 支持音标
-    ]
-
-    for path in font_paths:
-        if os.path.exists(path):
-            font_name = os.path.splitext(os.path.basename(path))[0]
-            LabelBase.register(name=font_name, fn_regular=path)
-            print(f"已注册字体: {font_name} 路径: {path}")
-            break
+    from sqlite_store import WordStore
+except ImportError:
+    # 安卓打包时没有包含sqlite3，只使用预编译的词库
+    WordStore = None
+
+# 注册控件使用的字体名称（simsun、SimHei、times），优先使用随包的子集字体
+try:
+    register_fonts()
 except Exception as e:
-    print(f"注册字体时出错: {str(e)}")
+    report_error('注册字体', e)
 
 # 设置窗口背景色为护眼色
 Window.clearcolor = (0.93, 1, 0.93, 1)
@@ -59,7 +71,32 @@ COLORS = {
     'button_text': (0.2, 0.2, 0.2, 1),  # 深色按钮文字，统一所有按钮的文字颜色
     'button_hover': (0.8, 0.8, 0.8, 0.2)  # 悬停效果
 }
-print(f"COLORS字典初始化完成 - button颜色: {COLORS['button']}")
+logger.debug("EngRem: COLORS字典初始化完成 - button颜色: %s", COLORS['button'])
+
+
+# 切换分类或单词时预加载后面几个单词的音频
+PRELOAD_WORD_COUNT = 5
+
+# 是否优先使用与正确音节长度相近或有共同字母的干扰音节
+CONFUSABLE_OPTIONS = False
+
+CATEGORY_TITLE = '选择单词类别'
+
+# build_assets.py生成的资源清单和可选的SQLite词库
+MANIFEST_PATH = 'data_four/manifest.json'
+WORD_STORE_PATH = 'data_four/words.db'
+
+# 答题使用的工作簿（统一使用words_four2.xlsx）
+WORD_BANK_XLSX = 'data_four/words_four2.xlsx'
+# 拼写纠错索引包含这些工作簿中的所有单词
+VOCABULARY_WORKBOOKS = (WORD_BANK_XLSX, 'data_four/words_four.xlsx')
+# 手动输入答错时最多提示的相近单词数
+SUGGESTION_COUNT = 3
+
+
+def gc_collection_count():
+    """所有代的垃圾回收累计次数，用于衡量切换单词时的内存分配压力"""
+    return sum(stat['collections'] for stat in gc.get_stats())
 
 
 # 彩色标签类 - 用于显示元音和辅音不同颜色
@@ -76,42 +113,28 @@ class ColoredLabel(BoxLayout):
         self.add_colored_chars(text)
 
     def add_colored_chars(self, text):
-        vowels = set('aeiouAEIOU')
-        self.char_labels = []
-
-        # 创建一个水平布局来包裹所有字符标签，并使其居中
-        chars_container = BoxLayout(orientation='horizontal', size_hint_x=1)
-
-        # 计算字符总数
-        total_chars = len(text)
-
-        for char in text:
-            # 检查是否为元音
-            if char in vowels:
-                color = COLORS['vowel']
-            else:
-                color = COLORS['consonant']
-
-            char_label = Label(
-                text=char,
-                font_size='36sp',  # 增大字体
-                color=color,  # 按照元音和辅音分色显示，而不是使用button_text颜色
-                size_hint_x=1.0 / total_chars,  # 平均分配宽度
-                halign='center',  # 水平居中
-                valign='middle',  # 垂直居中
-                text_size=(None, None),  # 让文本大小自适应
-                font_name='simsun'  # 使用已注册的字体
-            )
-            chars_container.add_widget(char_label)
-            self.char_labels.append(char_label)
+        # 整段文字使用一个共享的分色纹理，不再为每个字符创建一个Label
+        self.text_image = Image(
+            texture=colored_texture(
+                text,
+                font_name='simsun',  # 使用已注册的字体
+                font_size=sp(36),  # 增大字体
+                vowel_hex=rgba_to_hex(COLORS['vowel']),  # 按照元音和辅音分色显示
+                consonant_hex=rgba_to_hex(COLORS['consonant']),
+                bold=False
+            ) if text else None,
+            fit_mode='scale-down',  # 保持原始大小并居中
+            size_hint=(1, 1)
+        )
 
-        # 将容器添加到按钮
-        self.add_widget(chars_container)
+        # 将纹理添加到布局
+        self.add_widget(self.text_image)
 
 
 # 彩色按钮类 - 用于选项按钮
+# 按钮会被WordLearningScreen反复复用，切换单词时通过rebind更新文字和回调，不再重新创建
 class ColoredButton(ButtonBehavior, BoxLayout):
-    def __init__(self, text, callback, **kwargs):
+    def __init__(self, text='', callback=None, **kwargs):
         # 移除kwargs中可能包含的不支持属性
         if 'halign' in kwargs:
             del kwargs['halign']
@@ -119,14 +142,14 @@ class ColoredButton(ButtonBehavior, BoxLayout):
             del kwargs['valign']
         super().__init__(**kwargs)
         self.orientation = 'horizontal'
-        self.text = text
-        self.callback = callback
+        self.text = ''
+        self.callback = None
         self.padding = [10, 5]
         self.size_hint_y = None
         self.height = 100  # 增加按钮高度
         self.size_hint_x = 1  # 确保按钮占满整个网格单元
 
-        print(f"ColoredButton初始化 - 使用button颜色: {COLORS['button']}")
+        logger.debug("EngRem: ColoredButton初始化 - 使用button颜色: %s", COLORS['button'])
 
         # 设置背景 - 使用更浅的背景色
         with self.canvas.before:
@@ -135,55 +158,27 @@ class ColoredButton(ButtonBehavior, BoxLayout):
 
         self.bind(pos=self.update_rect, size=self.update_rect)
 
-        # 延迟添加字符，确保布局已初始化
-        Clock.schedule_once(lambda dt: self.add_colored_chars(text), 0)
+        # 显示分色音节的纹理，相同音节共用缓存中的纹理，尺寸变化时无需重新排版
+        self.text_image = Image(
+            fit_mode='scale-down',  # 保持原始大小并居中
+            size_hint=(1, 1)  # 占满整个按钮
+        )
+        self.add_widget(self.text_image)
+
+        self.rebind(text, callback)
+
+    def rebind(self, text, callback):
+        # 复用按钮：更新显示的音节和点击回调，并恢复背景色
+        self.text = text
+        self.callback = callback
+        self.bg_color.rgba = COLORS['button']
+        # 使用支持更好的字体，显著增大字体大小
+        self.text_image.texture = colored_texture(text, font_name='SimHei', font_size=40) if text else None
 
     def update_rect(self, instance, value):
         self.rect.pos = instance.pos
         self.rect.size = instance.size
 
-    def add_colored_chars(self, text):
-        vowels = set('aeiouAEIOU')
-        # 创建一个水平布局来包裹文本标签
-        chars_container = BoxLayout(orientation='horizontal', size_hint_x=1)
-        chars_container.bind(size=self.update_text_label_size)
-
-        # 构建带有颜色和加粗样式的文本
-        colored_text = ''
-        for char in text:
-            # 检查是否为元音
-            if char in vowels:
-                color = 'ff4500'  # 橙红色 - 元音
-            else:
-                color = '6495ed'  # 蓝色 - 辅音
-
-            # 添加加粗和颜色样式
-            colored_text += f'[b][color={color}]{char}[/color][/b]'
-
-        # 创建一个标签显示整个文本，使用markup=True支持富文本
-        self.text_label = Label(
-            text=colored_text,
-            markup=True,  # 启用富文本标记
-            font_size=40,  # 显著增大字体大小
-            halign='center',  # 水平居中
-            valign='middle',  # 垂直居中
-            size_hint=(1, 1),  # 占满整个容器
-            text_size=chars_container.size,  # 文本大小适应容器
-            font_name='SimHei'  # 使用支持更好的字体
-        )
-
-        chars_container.add_widget(self.text_label)
-        # 将容器添加到按钮
-        self.add_widget(chars_container)
-
-    def update_text_label_size(self, instance, value):
-        # 确保文本标签在容器中居中显示
-        if hasattr(self, 'text_label') and value[0] > 0 and value[1] > 0:
-            # 更新文本标签的大小以适应容器
-            self.text_label.text_size = (value[0], None)
-            # 强制重新计算文本大小
-            self.text_label.texture_update()
-
     def on_press(self):
         # 改变背景色表示按下
         self.bg_color.rgba = COLORS['button_hover']
@@ -195,11 +190,31 @@ class ColoredButton(ButtonBehavior, BoxLayout):
         self.callback(self.text)
 
 
+# 分类按钮 - 作为RecycleView的viewclass，滚动时被复用并重新绑定分类名称
+class CategoryTile(Button):
+    screen = ObjectProperty(None, allownone=True)
+    category = StringProperty('')  # 分类名称（text中还显示单词数）
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault('font_size', '20sp')  # 减小字体大小
+        kwargs.setdefault('halign', 'center')
+        kwargs.setdefault('background_color', COLORS['button'])  # 更浅的按钮背景
+        kwargs.setdefault('color', COLORS['button_text'])  # 统一的文字颜色
+        kwargs.setdefault('font_name', 'simsun')  # 使用已注册的字体
+        super().__init__(**kwargs)
+
+    def on_press(self):
+        if self.screen is not None:
+            self.screen.on_category_selected(self)
+
+
 # 分类选择页面 - 完整实现
 class CategorySelectionScreen(Screen):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.app = None
+        self.loading = False  # 是否正在后台加载分类
+        self.loading_started = 0
         self.build_ui()
 
     def set_app(self, app):
@@ -217,28 +232,31 @@ class CategorySelectionScreen(Screen):
             self.rect = Rectangle(pos=main_layout.pos, size=main_layout.size)
             main_layout.bind(pos=self.update_rect, size=self.update_rect)
 
-        # 标题标签
-        title_label = Label(
-            text='选择单词类别',
+        # 标题标签 - 后台加载分类时显示加载状态
+        self.title_label = Label(
+            text=CATEGORY_TITLE,
             font_size='48sp',
             color=COLORS['text'],
             size_hint_y=0.2,
             font_name='simsun'
         )
-        main_layout.add_widget(title_label)
+        main_layout.add_widget(self.title_label)
 
-        # 分类按钮区域 - 使用滚动视图
-        categories_scroll = ScrollView(size_hint_y=0.7)
-        self.categories_layout = GridLayout(
+        # 分类按钮区域 - 使用RecycleView，只为可见的分类创建按钮，分类再多也不会变慢
+        self.categories_view = RecycleView(size_hint_y=0.7)
+        self.categories_view.viewclass = CategoryTile
+        categories_layout = RecycleGridLayout(
             cols=5,  # 5列布局
             spacing=15,
             padding=10,
+            default_size=(None, 80),  # 减小按钮高度
+            default_size_hint=(1, None),
             size_hint_y=None
         )
-        self.categories_layout.bind(minimum_height=self.categories_layout.setter('height'))
-        categories_scroll.add_widget(self.categories_layout)
+        categories_layout.bind(minimum_height=categories_layout.setter('height'))
+        self.categories_view.add_widget(categories_layout)
 
-        main_layout.add_widget(categories_scroll)
+        main_layout.add_widget(self.categories_view)
 
         # 添加主布局到屏幕
         self.add_widget(main_layout)
@@ -252,52 +270,69 @@ class CategorySelectionScreen(Screen):
             return
 
         try:
-            # 尝试加载Excel文件
-            excel_file = 'data_four/words_four2.xlsx'
-            # 使用resource_find查找文件路径
-            actual_path = resource_find(excel_file)
-            if not actual_path or not os.path.exists(actual_path):
-                self.show_error(f'找不到Excel文件: {excel_file}')
+            # 从编译后的词库读取所有工作表名称作为分类，不再解析xlsx
+            word_bank = self.app.get_word_bank()
+            if word_bank is None:
+                self.show_error('找不到Excel文件: data_four/words_four2.xlsx')
                 return
+            categories = word_bank.sheet_names
+            # 单词数来自词库的索引，不需要读取单词
+            counts = word_bank.category_counts()
 
-            # 读取Excel文件的所有工作表名称作为分类
-            xl = pd.ExcelFile(actual_path)
-            categories = xl.sheet_names
-
-            # 清空现有按钮
-            self.categories_layout.clear_widgets()
-
-            # 为每个分类创建按钮 - 使用更浅的背景色和统一的文字颜色
-            for category in categories:
-                category_button = Button(
-                    text=category,
-                    font_size='20sp',  # 减小字体大小
-                    background_color=COLORS['button'],  # 更浅的按钮背景
-                    color=COLORS['button_text'],  # 统一的文字颜色
-                    size_hint_y=None,
-                    height=80,  # 减小按钮高度
-                    font_name='simsun'  # 使用已注册的字体
-                )
-
-                # 绑定按钮事件
-                category_button.bind(on_press=self.on_category_selected)
-
-                # 添加到布局
-                self.categories_layout.add_widget(category_button)
+            # 更新分类数据即可，RecycleView会复用已有的按钮
+            self.categories_view.data = [
+                {'text': f'{category}\n{counts[category]} 个单词' if category in counts else category,
+                 'category': category, 'screen': self}
+                for category in categories
+            ]
 
         except Exception as e:
+            report_error('加载分类', e)
             self.show_error(f'加载分类时出错: {str(e)}')
 
     def on_category_selected(self, instance):
-        if not self.app:
+        # 获取选中的分类名称
+        self.open_category(instance.category)
+
+    def open_category(self, category):
+        # 加载过程中忽略重复点击
+        if not self.app or self.loading:
             return
 
+        # 在后台线程中加载，界面只显示加载状态
+        self.loading_started = time.perf_counter()
+        self.set_loading(True, category)
+        threading.Thread(target=self.load_category_in_background, args=(category,), daemon=True).start()
+
+    def set_loading(self, loading, category=''):
+        self.loading = loading
+        self.categories_view.disabled = loading
+        self.title_label.text = f'正在加载 {category} ...' if loading else CATEGORY_TITLE
+
+    def load_category_in_background(self, category):
+        # 在后台线程中运行：读取词库、创建答题引擎，并预读第一个单词的音频文件
+        # 这里不能操作任何控件，结果通过Clock.schedule_once交回主线程
+        session = None
+        error = None
         try:
-            # 获取选中的分类名称
-            category = instance.text
+            session = self.app.load_category_words(category)
+            if session is not None and not session.finished:
+                prefetch_file(self.app.sound_index.path_for(session.current_word))
+        except Exception as e:
+            error = e
+        Clock.schedule_once(lambda dt: self.on_category_loaded(category, session, error))
 
-            # 加载该分类的单词
-            self.app.load_category_words(category)
+    def on_category_loaded(self, category, session, error):
+        self.set_loading(False)
+        try:
+            if error is not None:
+                raise error
+            if session is None:
+                self.show_error(f'加载分类 {category} 失败')
+                return
+
+            # 开始答题并预加载前面几个单词的音频
+            self.app.start_session(session)
 
             # 切换到单词学习页面
             self.manager.current = 'word_learning'
@@ -305,8 +340,12 @@ class CategorySelectionScreen(Screen):
             # 让WordLearningScreen加载第一个单词
             word_screen = self.manager.get_screen('word_learning')
             word_screen.load_word()
+            elapsed = (time.perf_counter() - self.loading_started) * 1000
+            instrument.record('load_category', elapsed)
+            logger.debug('EngRem: 从点击分类到显示第一个单词: %.1f ms', elapsed)
 
         except Exception as e:
+            report_error('选择分类', e)
             self.show_error(f'选择分类时出错: {str(e)}')
 
     def show_error(self, message):
@@ -335,8 +374,9 @@ class WordLearningScreen(Screen):
         self.app = None
         self.current_sound = None
         self.has_sound = True  # 新增：控制是否播放音频
-        self.hint_index = 0  # 新增：提示计数
-        self.correct_count = 0  # 初始化正确计数
+        self.option_buttons = []  # 选项按钮池，切换单词时复用
+        self.prepared_word = None  # 答对后已经准备好的下一个单词
+        self.next_word_event = None
         self.build_ui()
 
     def set_app(self, app):
@@ -345,7 +385,7 @@ class WordLearningScreen(Screen):
     def build_ui(self):
         # 主布局
         main_layout = BoxLayout(orientation='vertical', padding=20, spacing=20)
-        print(f"WordLearningScreen创建按钮 - 使用button颜色: {COLORS['button']}")
+        logger.debug("EngRem: WordLearningScreen创建按钮 - 使用button颜色: %s", COLORS['button'])
         # 设置整个背景颜色为护眼色
         with main_layout.canvas.before:
             Color(0.93, 1, 0.93, 1)  # 护眼色
@@ -385,16 +425,8 @@ class WordLearningScreen(Screen):
 
         # 左侧空白空间，使汉字居中
         chinese_speaker_layout.add_widget(Label(size_hint_x=0.9))
-        # 汉字标签
-        self.chinese_label = Label(
-            text="",  # 初始为空，稍后在load_word中设置
-            font_size=100,  # 默认字体大小
-            color=COLORS['text'],
-            font_name='simsun',
-            size_hint_x=0.5,
-            halign='center',
-            valign='middle'
-        )
+        # 汉字标签 - 两个标签交替使用：答对后在后台的标签上排版下一个单词，进入下一题时直接换上
+        self.chinese_label, self.spare_chinese_label = self.create_chinese_label(), self.create_chinese_label()
         chinese_speaker_layout.add_widget(self.chinese_label)
 
         # 发音按钮 - 喇叭图标，放置在汉字右侧
@@ -404,8 +436,8 @@ class WordLearningScreen(Screen):
             background_color=COLORS['button'],
             size_hint=(0.2, 0.4),  # 调整宽度和高度
             pos_hint={'x': -1, 'center_y': 0.4},  # 调整位置
-            background_normal='data/image/voice1.png',
-            background_down='data/image/voice.png',
+            background_normal=image_source('voice1'),  # 按屏幕密度从图集中选择
+            background_down=image_source('voice'),
             valign='middle'
         )
         chinese_speaker_layout.add_widget(self.speaker_button)
@@ -477,7 +509,17 @@ class WordLearningScreen(Screen):
             background_color=(1, 1, 1, 1),  # 白色背景
             font_name='simsun'
         )
+        # 手动输入答案后按回车提交，答错时提示词库中拼写相近的单词
+        self.answer_input.bind(on_text_validate=self.submit_typed_answer)
         self.answer_layout.add_widget(self.answer_input)
+        self.suggestion_label = Label(
+            text='',
+            font_size='18sp',
+            color=COLORS['text'],
+            size_hint_y=0.3,
+            font_name='simsun'
+        )
+        self.answer_layout.add_widget(self.suggestion_label)
         main_layout.add_widget(self.answer_layout)
 
         # 选项区域 - 使用滚动视图
@@ -500,6 +542,26 @@ class WordLearningScreen(Screen):
         self.rect.pos = instance.pos
         self.rect.size = instance.size
 
+    def create_chinese_label(self):
+        return Label(
+            text="",  # 初始为空，稍后在load_word中设置
+            font_size=100,  # 默认字体大小
+            color=COLORS['text'],
+            font_name='simsun',
+            size_hint_x=0.5,
+            halign='center',
+            valign='middle'
+        )
+
+    def swap_chinese_label(self):
+        # 换上已经排版好的标签，位置不变
+        visible, spare = self.chinese_label, self.spare_chinese_label
+        layout = visible.parent
+        index = layout.children.index(visible)
+        layout.remove_widget(visible)
+        layout.add_widget(spare, index)
+        self.chinese_label, self.spare_chinese_label = spare, visible
+
     def _adjust_font_size_based_on_length(self, label):
         """根据文本长度动态调整字体大小"""
         if not label.text:  # 如果文本为空，不进行调整
@@ -521,27 +583,39 @@ class WordLearningScreen(Screen):
         # 强制标签重新布局以应用新的字体大小
         label.texture_update()
 
+    @instrument.timed('load_word')
     def load_word(self):
-        if not self.app or not hasattr(self.app, 'current_words') or not self.app.current_words:
+        session = self.app.session if self.app else None
+        if session is None or session.finished:
             return
+        # 调试模式下记录切换单词的开始时间和GC次数，在下一帧绘制完成后输出
+        if debug_enabled():
+            started = time.perf_counter()
+            collections = gc_collection_count()
+            Clock.schedule_once(lambda dt: logger.debug(
+                "EngRem: 切换单词耗时(含下一帧): %.1f ms, GC次数: %d",
+                (time.perf_counter() - started) * 1000, gc_collection_count() - collections), 0)
+
         # 清空输入和选项
-        if hasattr(self.app, 'selected_pronunciations'):
-            self.app.selected_pronunciations = []
         self.answer_input.text = ''
-        self.options_layout.clear_widgets()
-        self.hint_index = 0  # 重置提示计数
+        self.suggestion_label.text = ''
 
         # 获取当前单词
         try:
-            current_word = self.app.current_words[self.app.current_word_index]
-            print(f"加载单词: {current_word.get('chinese', '未知')}, 音频文件: {current_word.get('sound', '')}")
+            current_word = session.current_word
+            logger.debug("EngRem: 加载单词: %s, 音频文件: %s", current_word.chinese, current_word.sound)
 
-            # 更新标签
-            self.chinese_label.text = str(current_word.get('chinese', ''))
-            # 调整字体大小
-            self._adjust_font_size_based_on_length(self.chinese_label)
+            if current_word is self.prepared_word:
+                # 答对后已经排版好，直接换上
+                self.swap_chinese_label()
+            else:
+                # 更新标签
+                self.chinese_label.text = current_word.chinese
+                # 调整字体大小
+                self._adjust_font_size_based_on_length(self.chinese_label)
+            self.prepared_word = None
 
-            pronunciation_text = str(current_word.get('syllables', ''))
+            pronunciation_text = current_word.syllables
             self.pronunciation_button.text = pronunciation_text
             self.pronunciation_button.halign = 'center'
             self.pronunciation_button.valign = 'middle'
@@ -550,75 +624,104 @@ class WordLearningScreen(Screen):
             self.load_options()
 
             # 更新进度显示
-            if hasattr(self.app, 'current_words'):
-                total_count = len(self.app.current_words)
-                self.progress_label.text = f"已答对 {self.correct_count}/{total_count}"
+            self.update_progress()
 
             # 自动播放音频
             self.play_pronunciation(None)
+
+            # 预加载后面几个单词的音频
+            self.preload_upcoming_sounds()
         except Exception as e:
-            print(f"加载单词信息时出错: {str(e)}")
+            report_error('加载单词信息', e)
+
+    def update_progress(self):
+        session = self.app.session
+        self.progress_label.text = f"已答对 {session.correct_count}/{session.total}"
 
+    @instrument.timed('load_options')
     def load_options(self):
         try:
-            # 获取当前单词的正确发音字节 - 从pronunciation字段获取音节
-            current_word = self.app.current_words[self.app.current_word_index]
-            pronunciation_str = str(current_word.get('pronunciation', '')).strip()
-            current_syllables = pronunciation_str.split(',') if pronunciation_str else []
-
-            # 排除当前单词的正确发音字节
-            if hasattr(self.app, 'all_pronunciations'):
-                other_syllables = [s for s in self.app.all_pronunciations if s not in current_syllables]
-                random.shuffle(other_syllables)
-            else:
-                other_syllables = []
-
-            # 复制当前单词的正确发音字节
-            all_options = current_syllables.copy()
-
-            # 补充干扰选项，直到达到8个选项
-            while len(all_options) < 10 and other_syllables:
-                all_options.append(other_syllables.pop(0))
-
-            # 打乱选项顺序
-            random.shuffle(all_options)
-
-            # 创建按钮
-            for syllable in all_options:
-                # 使用ColoredButton而不是普通Button
-                option_button = ColoredButton(
-                    text=syllable,
-                    callback=self.add_syllable
-                )
-                self.options_layout.add_widget(option_button)
+            # 正确音节加上干扰音节，由答题引擎生成并打乱
+            all_options = self.app.session.options()
+
+            # 复用已有的选项按钮，只在按钮不够时才创建新的
+            while len(self.option_buttons) < len(all_options):
+                self.option_buttons.append(ColoredButton())
+
+            for index, option_button in enumerate(self.option_buttons):
+                if index < len(all_options):
+                    option_button.rebind(all_options[index], self.add_syllable)
+                    if option_button.parent is None:
+                        self.options_layout.add_widget(option_button)
+                elif option_button.parent is not None:
+                    # 多余的按钮暂时移出布局，留在池中下次复用
+                    self.options_layout.remove_widget(option_button)
 
         except Exception as e:
-            print(f"加载选项时出错: {str(e)}")
+            report_error('加载选项', e)
 
     def add_syllable(self, syllable):
-        # 添加选中的音节到输入框
-        current_text = self.answer_input.text
-        self.answer_input.text = current_text + syllable
+        # 从点击音节到界面更新的耗时
+        instrument.mark_interaction('tap_to_frame')
+        session = self.app.session
+        # 答对后等待进入下一题期间的点击不再追加音节，也不改变答案框的颜色
+        if session is None or session.finished or session.answered:
+            return
+        # 输入框可以手动编辑，以输入框中的文字为准
+        session.set_answer(self.answer_input.text)
+        # 添加选中的音节到输入框并检查答案
+        correct = session.add_syllable(syllable)
+        self.answer_input.text = session.answer
+        if correct:
+            self.on_correct_answer()
+        else:
+            self.show_prefix_state()
 
-        # 检查答案
-        self.check_answer()
+    def show_prefix_state(self):
+        # 答案已经不是正确单词的开头时，答案框立即变红，清空后恢复
+        session = self.app.session
+        self.answer_input.background_color = COLORS['incorrect'] if not session.is_prefix else (1, 1, 1, 1)
 
     def clear_selection(self, instance=None):
         # 清空输入框
+        if self.app and self.app.session is not None:
+            self.app.session.clear()
         self.answer_input.text = ''
+        self.answer_input.background_color = (1, 1, 1, 1)
+        self.suggestion_label.text = ''
+
+    def submit_typed_answer(self, instance):
+        # 手动输入的答案：答对时与点击音节答对相同，答错时提示拼写相近的单词
+        instrument.mark_interaction('tap_to_frame')
+        session = self.app.session if self.app else None
+        if session is None or session.finished or session.answered:
+            return
+        try:
+            if session.submit(self.answer_input.text):
+                self.answer_input.text = session.answer
+                self.suggestion_label.text = ''
+                self.on_correct_answer()
+                return
+            self.answer_input.background_color = COLORS['incorrect']
+            index = self.app.spelling_index
+            suggestions = index.suggest(self.answer_input.text, SUGGESTION_COUNT) if index is not None else []
+            self.suggestion_label.text = f"您是不是要输入: {', '.join(suggestions)}" if suggestions else '拼写不正确'
+        except Exception as e:
+            report_error('检查输入的答案', e)
 
     def play_pronunciation(self, instance):
         if self.has_sound:
             # 播放当前单词的发音
-            if not self.app or not hasattr(self.app, 'current_words') or not self.app.current_words:
+            session = self.app.session if self.app else None
+            if session is None or session.finished:
                 return
 
             try:
-                current_word = self.app.current_words[self.app.current_word_index]
-                self.pronounce_word(current_word)
+                self.pronounce_word(session.current_word)
             except Exception as e:
-                print(f"播放当前单词发音时出错: {str(e)}")
+                report_error('播放当前单词发音', e)
 
+    @instrument.timed('pronounce_word')
     def pronounce_word(self, word):
         # 停止当前播放的声音
         if self.current_sound:
@@ -626,128 +729,114 @@ class WordLearningScreen(Screen):
             self.current_sound = None
 
         try:
-            # 获取音频文件名
-            sound_file = word.get('sound', '')
-            if not sound_file:
-                print("没有音频文件")
+            # 音频路径在启动时已经解析好，这里只是一次字典查找
+            actual_path = self.app.sound_index.path_for(word)
+            if not actual_path:
                 return
 
-            # 确保文件扩展名正确
-            if not sound_file.endswith('.wav'):
-                sound_file += '.wav'
-
-            # 修复音频路径 - 直接使用Excel中指定的路径
-            sound_path = sound_file
-
-            # 如果sound_file不包含路径分隔符，添加默认路径
-            if '\\' not in sound_file and '/' not in sound_file:
-                sound_path = os.path.join("data", "sound", sound_file)
-
-            print(f"尝试加载音频文件: {sound_path}")
-
-            # 使用resource_find查找文件路径
-            actual_path = resource_find(sound_path)
-            if not actual_path:
-                print(f"资源查找失败，尝试直接使用路径: {sound_path}")
-                actual_path = sound_path
-
-            # 直接尝试加载音频文件
-            if os.path.exists(actual_path):
-                try:
-                    print(f"找到文件: {actual_path}")
-                    self.current_sound = SoundLoader.load(actual_path)
-                    if self.current_sound:
-                        print(f"成功加载并播放音频: {actual_path}")
-                        self.current_sound.play()
-                    else:
-                        print(f"无法加载音频文件: {actual_path} (SoundLoader返回None)")
-                except Exception as e:
-                    print(f"播放音频时出错: {str(e)}")
-            else:
-                print(f"音频文件不存在: {actual_path}")
+            # 从缓存中取已解码的音频，只有第一次播放时才真正加载
+            try:
+                self.current_sound = self.app.sound_cache.get(actual_path)
+                if self.current_sound:
+                    self.current_sound.play()
+                else:
+                    logger.warning("EngRem: 无法加载音频文件: %s (SoundLoader返回None)", actual_path)
+            except Exception as e:
+                report_error('播放音频', e)
 
         except Exception as e:
-            print(f"播放音频时出错: {str(e)}")
+            report_error('播放音频', e)
+
+    def preload_upcoming_sounds(self):
+        # 预加载当前单词之后的几个单词的音频，切换单词时无需等待解码
+        upcoming = self.app.session.upcoming(PRELOAD_WORD_COUNT)
+        self.app.sound_cache.preload([self.app.sound_index.path_for(word) for word in upcoming])
 
     def show_hint(self, instance):
+        instrument.mark_interaction('tap_to_frame')
         try:
-            if not self.app or not hasattr(self.app, 'current_words') or not self.app.current_words:
+            session = self.app.session if self.app else None
+            # 答对后等待进入下一题期间不再提示
+            if session is None or session.finished or session.answered:
                 return
 
-            current_word = self.app.current_words[self.app.current_word_index]
-            word = str(current_word.get('word', ''))
-
-            # 获取所有音节 - 从pronunciation字段获取（实际存储的是音节）
-            if 'pronunciation' in current_word and current_word['pronunciation']:
-                pronunciation_str = str(current_word['pronunciation'])
-                syllables = pronunciation_str.split(',')
-
-                # 检查是否还有未提示的音节
-                if self.hint_index < len(syllables):
-                    # 显示当前index对应的音节
-                    next_syllable = syllables[self.hint_index]
-                    self.answer_input.text += next_syllable
-                    # 增加提示索引，为下次提示做准备
-                    self.hint_index += 1
-                elif word:  # 如果所有音节都已提示但单词还不正确
-                    # 显示整个单词作为最终提示
-                    self.answer_input.text = word
-            elif word:  # 如果没有pronunciation字段但有word字段
-                # 显示整个单词作为提示
-                self.answer_input.text = word
-
-            # 检查答案
-            self.check_answer()
+            # 依次提示下一个音节，全部提示后显示整个单词，并检查答案
+            session.set_answer(self.answer_input.text)
+            correct = session.hint()
+            self.answer_input.text = session.answer
+            if correct:
+                self.on_correct_answer()
+            else:
+                self.show_prefix_state()
 
         except Exception as e:
-            print(f"显示提示时出错: {str(e)}")
+            report_error('显示提示', e)
 
     def toggle_sound(self, instance):
         self.has_sound = not self.has_sound
         instance.text = '关闭发音' if self.has_sound else '开启发音'
 
-    def check_answer(self):
+    def on_correct_answer(self):
         try:
-            if not self.app or not hasattr(self.app, 'current_words') or not self.app.current_words:
-                return
-
-            current_word = self.app.current_words[self.app.current_word_index]
-            correct_word = str(current_word.get('word', '')).strip()
-            user_answer = self.answer_input.text.strip()
+            # 回答正确，答案框背景变绿色
+            self.answer_input.background_color = COLORS['correct']
+            self.update_progress()
+            self.app.sync_answer(self.app.session)
 
-            # 修正：将correct_answer改为correct_word
-            if user_answer == correct_word:
-                # 回答正确，答案框背景变绿色
-                self.answer_input.background_color = COLORS['correct']
-                self.correct_count += 1
-                total_count = len(self.app.current_words)
-                self.progress_label.text = f"已答对 {self.correct_count}/{total_count}"
+            # 再读一遍正确音频
+            self.pronounce_word(self.app.session.current_word)
 
-                # 再读一遍正确音频
-                self.pronounce_word(current_word)
+            # 答对的反馈先显示出来，下一帧开始在延迟期间准备下一题
+            Clock.schedule_once(self.prepare_next_word, 0)
 
-                # 短暂延迟后进入下一题
-                def next_word_func(dt):
-                    self.next_word()
+            # 短暂延迟后进入下一题
+            def next_word_func(dt):
+                self.next_word_event = None
+                self.next_word()
 
-                Clock.schedule_once(next_word_func, 1)
+            self.next_word_event = Clock.schedule_once(next_word_func, 1)
 
         except Exception as e:
-            print(f"检查答案时出错: {str(e)}")
+            report_error('检查答案', e)
+
+    @instrument.timed('prepare_next_word')
+    def prepare_next_word(self, dt=None):
+        # 生成下一题的选项并光栅化选项纹理、解码下一个单词的音频、在后台的标签上排版汉字，
+        # 延迟结束后load_word只需换上准备好的内容
+        session = self.app.session if self.app else None
+        if session is None or session.finished or not session.answered:
+            return
+        try:
+            word, options = session.prepare_next()
+            # 复习记录已经写入日志，进度也要同时保存：延迟期间应用被结束时，恢复后的计数包含这个单词
+            self.app.record_progress()
+            if word is None:
+                return
+            for option in options:
+                colored_texture(option, font_name='SimHei', font_size=40)
+            if self.has_sound:
+                path = self.app.sound_index.path_for(word)
+                if path:
+                    self.app.sound_cache.get(path)
+            self.spare_chinese_label.text = word.chinese
+            self._adjust_font_size_based_on_length(self.spare_chinese_label)
+            self.prepared_word = word
+        except Exception as e:
+            report_error('准备下一个单词', e)
 
     def next_word(self):
         try:
-            if not self.app or not hasattr(self.app, 'current_words') or not self.app.current_words:
+            session = self.app.session if self.app else None
+            if session is None:
                 return
 
             # 恢复答案框背景颜色
             self.answer_input.background_color = (1, 1, 1, 1)
 
-            # 更新当前单词索引
-            self.app.current_word_index += 1
-
             # 检查是否所有单词都学习完毕
-            if self.app.current_word_index >= len(self.app.current_words):
+            has_next = session.advance()
+            self.app.record_progress()
+            if not has_next:
                 # 所有单词学习完毕，可以添加一些提示或返回到分类选择页面
                 self.show_finish_message()
                 return
@@ -756,7 +845,7 @@ class WordLearningScreen(Screen):
             self.load_word()
 
         except Exception as e:
-            print(f"加载下一个单词时出错: {str(e)}")
+            report_error('加载下一个单词', e)
 
     def show_finish_message(self):
         # 创建完成消息弹窗
@@ -807,8 +896,13 @@ class WordLearningScreen(Screen):
         popup.open()
 
     def go_back(self, instance):
-        # 重置正确计数
-        self.correct_count = 0
+        # 结束本次答题（正确计数随之重置），取消还没有进入的下一题
+        if self.next_word_event is not None:
+            self.next_word_event.cancel()
+            self.next_word_event = None
+        self.prepared_word = None
+        self.app.session = None
+        self.app.record_progress()
         # 切换到分类选择页面
         self.manager.current = 'category_selection'
 
@@ -822,8 +916,24 @@ class WordSpellingApp(App):
         self.has_sound = True
         self.hint_index = 0
         self.correct_count = 0  # 新增：记录已答对的数量
+        self.word_bank = None  # 编译后的词库，第一次加载分类时打开
+        self.sound_cache = SoundCache()  # 已解码音频的缓存，所有页面共用
+        self.sound_index = SoundIndex()  # 音频路径索引，在build中建立
+        self.session = None  # 当前分类的答题引擎
+        self.scheduler = None  # 间隔重复调度，保存每个单词的记忆状态
+        self.journal = None  # 进度日志，每次作答追加一条记录
+        self.spelling_index = None  # 拼写纠错索引，启动后在后台线程中建立
+        self.sync = None  # 进度同步，设置了ENGREM_SYNC_URL时上传答题结果
+        self.pending_resume = None  # 启动时要恢复的未完成练习
 
     def build(self):
+        # 从快照和进度日志恢复每个单词的复习记录和上次未完成的练习
+        self.restore_progress()
+        self.start_sync()
+
+        # 建立音频路径索引，并提前报告缺失的音频文件
+        self.build_sound_index()
+
         # 创建屏幕管理器
         self.sm = ScreenManager()
 
@@ -872,6 +982,161 @@ class WordSpellingApp(App):
 
         return self.sm
 
+    def on_start(self):
+        # 第一帧之前调用，输出从进程启动到界面就绪的耗时
+        logger.info('EngRem: 启动耗时: %.0f ms', (time.perf_counter() - STARTUP_BEGIN) * 1000)
+
+        # ENGREM_INSTRUMENT=1 时显示耗时统计浮层
+        instrument.install(Window)
+
+        # 手动输入答案时使用的拼写纠错索引，建立完成之前不提示相近的单词
+        threading.Thread(target=self.build_spelling_index, daemon=True).start()
+        # 使用打包的音频库时，在后台把音频导出为文件，播放时不需要再导出
+        if self.sound_index.bank is not None:
+            threading.Thread(target=self.export_sounds, daemon=True).start()
+
+        # 上次练习没有完成（例如应用在后台被系统结束）时，直接回到该分类
+        progress = self.pending_resume
+        if progress and progress.get('category'):
+            word_bank = self.get_word_bank()
+            if word_bank is not None and word_bank.has_sheet(progress['category']):
+                self.sm.get_screen('category_selection').open_category(progress['category'])
+            else:
+                # 词库中已经没有该分类（例如更换了xlsx），丢弃过期的进度
+                logger.info('EngRem: 找不到上次练习的分类 %s，不再恢复', progress['category'])
+                self.pending_resume = None
+                if self.journal is not None:
+                    self.journal.record_session(None)
+
+    def on_pause(self):
+        # 切到后台时等待进度写入磁盘（安卓上之后可能直接被系统结束）；
+        # 同步的事件只交给后台线程写入，不在界面线程中等待网络
+        if self.journal is not None:
+            self.journal.flush()
+        if self.sync is not None:
+            self.sync.flush()
+        return True
+
+    def on_stop(self):
+        if self.journal is not None:
+            self.journal.close()
+        if self.sync is not None:
+            self.sync.close()
+        if instrument.ENABLED:
+            self.dump_instrument()
+        # 退出时汇总本次运行中被捕获的错误
+        log_error_summary()
+
+    def dump_instrument(self):
+        try:
+            path = os.path.join(self.user_data_dir, instrument.DUMP_NAME)
+            instrument.dump(path)
+            logger.info('EngRem: 耗时统计已写入 %s', path)
+        except Exception as e:
+            report_error('写入耗时统计', e)
+
+    def restore_progress(self):
+        started = time.perf_counter()
+        self.journal = ProgressJournal(self.user_data_dir)
+        try:
+            self.scheduler = self.journal.restore()
+        except Exception as e:
+            # 进度文件无法读取时本次运行不记录进度，避免覆盖原来的文件
+            report_error('恢复学习进度', e)
+            self.journal = None
+            self.scheduler = Scheduler()
+            return
+        self.pending_resume = self.journal.session
+        self.journal.start()
+        logger.info('EngRem: 恢复学习进度: %d 个单词, 重放 %d 条记录, %.1f ms', len(self.scheduler.cards),
+                    self.journal.replayed, (time.perf_counter() - started) * 1000)
+
+    def start_sync(self):
+        try:
+            self.sync = SyncClient.from_env(self.user_data_dir)
+        except Exception as e:
+            report_error('开启进度同步', e)
+            return
+        if self.sync is not None:
+            self.sync.start()
+            logger.info('EngRem: 进度同步到 %s（班级 %s，设备 %s）',
+                        self.sync.url, self.sync.classroom, self.sync.device_id)
+
+    def sync_answer(self, session):
+        # 开启同步时记录本次答对的结果，由后台线程批量上传
+        if self.sync is not None:
+            self.sync.record_answer(session.current_word.word, session.category, session.recall_quality(),
+                                    session.wrong_taps, session.hint_index, session.revealed)
+
+    def record_progress(self):
+        # 每答完一个单词记录一次当前练习的进度，练习结束或返回时记录None
+        session = self.session
+        if self.journal is not None:
+            self.journal.record_session(session.progress() if session is not None and not session.all_answered
+                                        else None)
+
+    def build_sound_index(self):
+        try:
+            word_bank = self.get_word_bank()
+            manifest = self.load_manifest_sound_index(word_bank)
+            if manifest is not None:
+                # 资源清单与词库来自同一份xlsx，音频路径和缺失列表在构建时已经校验过
+                self.sound_index = manifest
+                return
+            roots = [resource_find(directory) for directory in SOUND_DIRS]
+            self.sound_index = SoundIndex.scan(roots)
+            if word_bank is None:
+                return
+            for category in word_bank.sheet_names:
+                self.sound_index.add_words(word_bank.load_sheet(category) or [])
+        except Exception as e:
+            report_error('建立音频索引', e)
+            return
+        if self.sound_index.missing:
+            logger.warning('EngRem: 共有 %d 个单词缺少音频文件: %s',
+                           len(self.sound_index.missing), ', '.join(self.sound_index.missing))
+
+    def export_sounds(self):
+        # 在后台线程中运行：与主线程同时导出同一个音频时各自写临时文件，不会冲突
+        try:
+            started = time.perf_counter()
+            exported = self.sound_index.bank.export_all()
+            if exported:
+                logger.info('EngRem: 从音频库导出 %d 个音频, %.0f ms', exported, (time.perf_counter() - started) * 1000)
+        except Exception as e:
+            report_error('导出音频', e)
+
+    def build_spelling_index(self):
+        # 在后台线程中运行：读取所有工作簿的单词并建立索引，完成后整体替换
+        try:
+            started = time.perf_counter()
+            words = []
+            for excel_file in VOCABULARY_WORKBOOKS:
+                word_bank = self.get_word_bank() if excel_file == WORD_BANK_XLSX else self.open_word_bank(excel_file)
+                if word_bank is None:
+                    continue
+                for category in word_bank.sheet_names:
+                    words.extend(word.word for word in word_bank.load_sheet(category) or [])
+            self.spelling_index = SpellingIndex(words)
+            logger.info('EngRem: 拼写纠错索引: %d 个单词, %.0f ms', len(self.spelling_index),
+                        (time.perf_counter() - started) * 1000)
+        except Exception as e:
+            report_error('建立拼写纠错索引', e)
+
+    def load_manifest_sound_index(self, word_bank):
+        # build_assets.py生成的资源清单，只有对应的xlsx与当前词库一致时才使用，否则返回None
+        manifest_path = resource_find(MANIFEST_PATH)
+        if not manifest_path or word_bank is None:
+            return None
+        with open(manifest_path, encoding='utf-8') as f:
+            decks = json.load(f).get('decks', [])
+        source_sha1 = word_bank.source_sha1
+        if not any(deck.get('sha1') == source_sha1 for deck in decks):
+            logger.info('EngRem: 资源清单与词库不一致，重新扫描音频目录')
+            return None
+        # 使用打包的音频库时，用到的音频导出到应用数据目录
+        return SoundIndex.from_manifest(manifest_path, os.path.join(self.user_data_dir, 'sounds'))
+
     def go_back(self, instance=None):
         # 如果当前在单词学习页面，返回分类选择页面
         if hasattr(self, 'sm') and self.sm.current == 'word_learning':
@@ -882,61 +1147,69 @@ class WordSpellingApp(App):
             if hasattr(self, 'progress_label'):
                 self.progress_label.text = "已答对 0/0"
 
+    def get_word_bank(self):
+        # 词库只在第一次使用时打开，源xlsx变化时会自动重新编译
+        if self.word_bank is None:
+            self.word_bank = self.open_word_bank(WORD_BANK_XLSX)
+        return self.word_bank
+
+    def open_word_bank(self, excel_file):
+        # 使用resource_find查找文件路径；安装包中可能只带预编译的词库
+        actual_path = resource_find(excel_file) or excel_file
+        name = os.path.splitext(os.path.basename(excel_file))[0]
+        bundled_path = resource_find(f'data_four/{name}.bank')
+        # 安装包中带有与xlsx一致的SQLite词库时优先使用
+        if WordStore is not None:
+            word_store = WordStore.open(resource_find(WORD_STORE_PATH), excel_file, actual_path)
+            if word_store is not None:
+                return word_store
+        if not os.path.exists(actual_path) and not bundled_path:
+            logger.error('EngRem: 找不到Excel文件: %s', excel_file)
+            return None
+        bank_path = os.path.join(self.user_data_dir, f'{name}.bank')
+        return WordBank(actual_path, bank_path, bundled_path).open()
+
     def load_category_words(self, category):
+        # 读取分类并返回新的答题引擎，失败时返回None
+        # 由CategorySelectionScreen在后台线程中调用，因此这里不能操作控件
         try:
-            # 尝试加载Excel文件 - 统一使用words_four2.xlsx
-            excel_file = 'data_four/words_four2.xlsx'
-            # 使用resource_find查找文件路径
-            actual_path = resource_find(excel_file)
-            if not actual_path or not os.path.exists(actual_path):
-                print(f'找不到Excel文件: {excel_file}')
-                return
+            # 从编译后的词库读取 - 统一使用words_four2.xlsx
+            word_bank = self.get_word_bank()
+            if word_bank is None:
+                return None
 
             # 读取指定分类（工作表）的数据
-            try:
-                df = pd.read_excel(actual_path, sheet_name=category)
-            except ValueError as e:
-                print(f'加载分类时出错: {str(e)}')
-                return
+            if not word_bank.has_sheet(category):
+                logger.error('EngRem: 加载分类时出错: 找不到工作表 %s', category)
+                return None
+            rows = word_bank.load_sheet(category)
 
             # 检查必要的列是否存在
-            required_columns = ['chinese', 'word', 'pronunciation', 'syllables', 'sound']
-            if not all(col in df.columns for col in required_columns):
-                print(f'Excel文件缺少必要的列。需要的列: {required_columns}')
-                return
-
-            # 转换为字典列表
-            self.current_words = []
-            self.all_pronunciations = []
-
-            for index, row in df.iterrows():
-                # 将pronunciation字段的值分割成列表
-                pronunciation_str = str(row.get('pronunciation', '')).strip()
-                pronunciations = pronunciation_str.split(',') if pronunciation_str else []
-
-                # 添加到所有发音列表中
-                self.all_pronunciations.extend(pronunciations)
-
-                # 创建单词信息字典
-                word_info = {
-                    'chinese': row.get('chinese', ''),
-                    'word': row.get('word', ''),
-                    'pronunciation': pronunciation_str,
-                    'syllables': row.get('syllables', ''),  # 存储音标
-                    'sound': row.get('sound', '')
-                }
-
-                self.current_words.append(word_info)
-
-            # 新增：对单词列表进行随机打乱
-            random.shuffle(self.current_words)
+            if rows is None:
+                logger.error('EngRem: Excel文件缺少必要的列。需要的列: %s', list(COLUMNS))
+                return None
 
-            # 初始化当前单词索引
-            self.current_word_index = 0
+            # 创建答题引擎：打乱单词顺序、按复习记录选出到期的单词，并建立干扰选项音节池
+            session = QuizSession(rows, confusable=CONFUSABLE_OPTIONS, scheduler=self.scheduler, category=category)
 
-            print(f'成功加载分类 "{category}" 的 {len(self.current_words)} 个单词')
+            logger.info('EngRem: 成功加载分类 "%s" 的 %d 个单词，本次练习 %d 个',
+                        category, len(rows), session.total)
+            return session
         except Exception as e:
-            print(f'加载单词时出错: {str(e)}')
+            report_error('加载单词', e)
+            return None
+
+    def start_session(self, session):
+        # 在主线程中调用：开始新的答题，如果是上次未完成的分类则接着之前的计数
+        progress = self.pending_resume
+        self.pending_resume = None
+        if progress and progress.get('category') == session.category:
+            session.resume(progress)
+        self.session = session
+
+        # 打乱后立即预加载最前面几个单词的音频
+        self.sound_cache.preload([self.sound_index.path_for(word)
+                                  for word in session.upcoming(PRELOAD_WORD_COUNT)])
 
 
 # 应用入口
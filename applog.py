@@ -0,0 +1,53 @@
+# 日志 - 用标准库logging代替print
+#
+# 记录器名为kivy.engrem，是kivy日志记录器的子记录器：运行应用时消息经由kivy的日志处理器输出
+# （安卓上进入logcat），不依赖kivy的模块（词库、基准测试等）也可以直接使用。
+# 消息统一写成 "EngRem: ..." 的形式，与kivy日志的 "标题: 内容" 格式一致；
+# 参数使用%格式延迟格式化，日志级别关闭时热路径上几乎没有开销。
+import logging
+import os
+from collections import Counter
+
+import instrument
+
+logger = logging.getLogger('kivy.engrem')
+
+# 运行时日志级别，可通过环境变量 ENGREM_LOG_LEVEL=debug/info/warning/error 设置
+DEFAULT_LEVEL = 'info'
+
+_error_counts = Counter()
+
+
+def set_verbosity(level):
+    """运行时切换日志级别，level可以是'debug'等名称或logging中的数值"""
+    if isinstance(level, str):
+        level = logging.getLevelName(level.upper())
+        if not isinstance(level, int):
+            level = logging.INFO
+    logger.setLevel(level)
+
+
+def debug_enabled():
+    # 构造日志参数本身有开销时（例如需要拼接列表），先检查级别
+    return logger.isEnabledFor(logging.DEBUG)
+
+
+def report_error(where, error):
+    """记录原来被 except Exception: print(...) 吞掉的错误，并按出错位置计数"""
+    _error_counts[where] += 1
+    logger.error('EngRem: %s出错: %s', where, error, exc_info=debug_enabled())
+
+
+def error_counts():
+    """按出错位置统计的错误次数，写入instrument.json"""
+    return dict(_error_counts)
+
+
+def log_error_summary():
+    if _error_counts:
+        logger.warning('EngRem: 本次运行共捕获 %d 个错误: %s', sum(_error_counts.values()),
+                       ', '.join(f'{where} x{count}' for where, count in _error_counts.most_common()))
+
+
+set_verbosity(os.environ.get('ENGREM_LOG_LEVEL', DEFAULT_LEVEL))
+instrument.register_stats('errors', error_counts)
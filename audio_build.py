@@ -0,0 +1,160 @@
+# 构建时的音频处理 - 统一格式（单声道、同一采样率、16位），裁掉首尾静音
+#
+# 开头的静音会直接表现为点击喇叭后的延迟，结尾的静音只会增加解码时间和安装包大小。
+# 只使用标准库wave和array，构建环境不需要额外的音频库；由build_assets.py调用
+import math
+import operator
+import os
+import sys
+import time
+import wave
+from array import array
+
+# 输出格式：16kHz、16位单声道，对单词发音足够
+TARGET_RATE = 16000
+TARGET_WIDTH = 2
+
+# 低于该幅度（相对于16位满幅）视为静音，约 -40 dBFS
+SILENCE_THRESHOLD = 0.01
+# 裁剪后在首尾保留的余量，避免切掉辅音的起音和尾音
+LEAD_PAD_MS = 20
+TRAIL_PAD_MS = 60
+
+# 降低采样率前的抗混叠低通滤波器：截止频率为新采样率奈奎斯特频率的80%，留出过渡带；
+# 滤波器每侧的长度为 ANTIALIAS_HALF_TAPS x 采样率之比（向上取整）个样本
+ANTIALIAS_CUTOFF = 0.8
+ANTIALIAS_HALF_TAPS = 16
+
+_FULL_SCALE = 32767
+
+
+def _to_int16(frames, sample_width):
+    """把wav的原始字节转换为16位整数样本"""
+    if sample_width == 1:
+        # 8位wav是无符号的
+        return array('h', ((b - 128) << 8 for b in frames))
+    if sample_width == 2:
+        samples = array('h', frames)
+        if sys.byteorder == 'big':
+            samples.byteswap()
+        return samples
+    if sample_width == 3:
+        return array('h', (int.from_bytes(frames[i + 1:i + 3], 'little', signed=True)
+                           for i in range(0, len(frames), 3)))
+    if sample_width == 4:
+        samples = array('i', frames)
+        if sys.byteorder == 'big':
+            samples.byteswap()
+        return array('h', (s >> 16 for s in samples))
+    raise wave.Error(f'不支持的采样宽度: {sample_width}')
+
+
+def read_wav(path):
+    """读取wav文件，返回(单声道16位样本, 采样率)"""
+    with wave.open(path, 'rb') as f:
+        channels = f.getnchannels()
+        rate = f.getframerate()
+        samples = _to_int16(f.readframes(f.getnframes()), f.getsampwidth())
+    if channels > 1:
+        # 多声道取平均值混为单声道
+        samples = array('h', (sum(samples[i:i + channels]) // channels
+                              for i in range(0, len(samples) - channels + 1, channels)))
+    return samples, rate
+
+
+def write_wav(path, samples, rate):
+    out = samples
+    if sys.byteorder == 'big':
+        out = array('h', samples)
+        out.byteswap()
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = path + '.tmp'
+    with wave.open(tmp_path, 'wb') as f:
+        f.setnchannels(1)
+        f.setsampwidth(TARGET_WIDTH)
+        f.setframerate(rate)
+        f.writeframes(out.tobytes())
+    os.replace(tmp_path, path)
+
+
+def lowpass_kernel(cutoff, half_width):
+    """加Blackman窗的sinc低通滤波器系数（共2 x half_width + 1个），cutoff为相对于采样率的截止频率(0-0.5)"""
+    kernel = []
+    for n in range(-half_width, half_width + 1):
+        sinc = 1.0 if n == 0 else math.sin(2 * math.pi * cutoff * n) / (2 * math.pi * cutoff * n)
+        window = 0.42 + 0.5 * math.cos(math.pi * n / half_width) + 0.08 * math.cos(2 * math.pi * n / half_width)
+        kernel.append(sinc * window)
+    # 直流增益为1
+    total = sum(kernel)
+    return [k / total for k in kernel]
+
+
+def lowpass(samples, cutoff, half_width):
+    """用lowpass_kernel滤波，返回与samples等长的浮点样本（两端按0补齐）"""
+    kernel = lowpass_kernel(cutoff, half_width)
+    padded = [0] * half_width + list(samples) + [0] * half_width
+    size = len(kernel)
+    return [sum(map(operator.mul, kernel, padded[i:i + size])) for i in range(len(samples))]
+
+
+def resample(samples, rate, target_rate):
+    """线性插值重采样；降低采样率时先低通滤波，去掉新采样率无法表示的高频，避免混叠"""
+    if rate == target_rate or not samples:
+        return samples
+    source = samples
+    if target_rate < rate:
+        source = lowpass(samples, ANTIALIAS_CUTOFF * target_rate / (2 * rate),
+                         ANTIALIAS_HALF_TAPS * math.ceil(rate / target_rate))
+    count = max(1, len(samples) * target_rate // rate)
+    step = rate / target_rate
+    last = len(source) - 1
+    out = array('h', bytes(2 * count))
+    for i in range(count):
+        position = i * step
+        j = int(position)
+        if j >= last:
+            value = source[last]
+        else:
+            value = source[j] + (source[j + 1] - source[j]) * (position - j)
+        # 滤波后可能略微超出16位范围
+        out[i] = max(-_FULL_SCALE - 1, min(_FULL_SCALE, round(value)))
+    return out
+
+
+def trim_silence(samples, rate, threshold=SILENCE_THRESHOLD, lead_pad_ms=LEAD_PAD_MS, trail_pad_ms=TRAIL_PAD_MS):
+    """裁掉首尾静音，返回(裁剪后的样本, 开头裁掉的样本数, 结尾裁掉的样本数)；全是静音时不裁剪"""
+    limit = int(threshold * _FULL_SCALE)
+    first = next((i for i, s in enumerate(samples) if abs(s) > limit), None)
+    if first is None:
+        return samples, 0, 0
+    last = next(i for i in range(len(samples) - 1, -1, -1) if abs(samples[i]) > limit)
+    start = max(0, first - rate * lead_pad_ms // 1000)
+    end = min(len(samples), last + 1 + rate * trail_pad_ms // 1000)
+    return samples[start:end], start, len(samples) - end
+
+
+def _timed_read(path):
+    started = time.perf_counter()
+    with wave.open(path, 'rb') as f:
+        f.readframes(f.getnframes())
+    return (time.perf_counter() - started) * 1000
+
+
+def process_file(source, target, rate=TARGET_RATE, threshold=SILENCE_THRESHOLD):
+    """处理一个音频文件并写入target，返回该文件的大小和延迟报告"""
+    samples, source_rate = read_wav(source)
+    samples = resample(samples, source_rate, rate)
+    trimmed, lead, trail = trim_silence(samples, rate, threshold)
+    write_wav(target, trimmed, rate)
+    return {
+        'source_size': os.path.getsize(source),
+        'size': os.path.getsize(target),
+        'duration_ms': round(len(trimmed) * 1000 / rate, 1),
+        # 开头裁掉的静音就是点击后到听到声音之间减少的时间
+        'lead_trimmed_ms': round(lead * 1000 / rate, 1),
+        'trail_trimmed_ms': round(trail * 1000 / rate, 1),
+        'source_read_ms': round(_timed_read(source), 3),
+        'read_ms': round(_timed_read(target), 3)
+    }
@@ -0,0 +1,134 @@
+# 答题引擎基准测试 - 不需要窗口，用随包的词库模拟大量答题过程
+#
+# 用法（在项目根目录）: python -m benchmarks.bench_quiz [--sessions 2000] [--seed 1]
+# 输出 options（原load_options，生成一个单词的选项）、hint（原show_hint）、check_answer（检查尚未拼完的答案）、
+# add_syllable（点击音节并检查答案）的每秒操作数和内存分配，以及 prepare_next（答对后的延迟期间
+# 记录结果、取出下一个单词并生成选项）的耗时。进入下一题后options()直接返回准备好的选项，
+# 因此options一行单独计时_options_for，反映生成选项本身的耗时
+import argparse
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from quiz import QuizSession
+from wordbank import WordBank
+
+WORKBOOKS = ('data_four/words_four2.xlsx', 'data_four/words_four.xlsx')
+
+
+def load_decks(cache_dir):
+    decks = []
+    for path in WORKBOOKS:
+        if not os.path.exists(path):
+            continue
+        bank_path = os.path.join(cache_dir, os.path.basename(path) + '.bank')
+        bank = WordBank(path, bank_path).open()
+        for name in bank.sheet_names:
+            words = bank.load_sheet(name)
+            if words:
+                decks.append((f'{os.path.basename(path)}:{name}', words))
+    return decks
+
+
+def play_session(session, rng, timings, counts):
+    """模拟一个学生完成一个分类：每个单词先看选项，随机使用提示，再逐个点击正确音节"""
+    perf_counter = time.perf_counter
+    while not session.finished:
+        started = perf_counter()
+        session._options_for(session.current_word)
+        timings['options'] += perf_counter() - started
+        counts['options'] += 1
+        # 界面实际调用的options()（第一题之后使用prepare_next准备好的选项）不计时
+        session.options()
+
+        if rng.random() < 0.3:
+            started = perf_counter()
+            session.hint()
+            timings['hint'] += perf_counter() - started
+            counts['hint'] += 1
+
+        for syllable in session.syllables()[session.hint_index:]:
+            if session.answered:
+                break
+            started = perf_counter()
+            session.check_answer()
+            timings['check_answer'] += perf_counter() - started
+            counts['check_answer'] += 1
+            started = perf_counter()
+            session.add_syllable(syllable)
+            timings['add_syllable'] += perf_counter() - started
+            counts['add_syllable'] += 1
+
+        # 音节拼不出单词时（例如 to-do list）用提示直接给出整个单词
+        while not session.answered:
+            session.hint()
+        started = perf_counter()
+        session.prepare_next()
+        timings['prepare_next'] += perf_counter() - started
+        counts['prepare_next'] += 1
+        session.advance()
+
+
+def measure_allocations(decks, seed, repeat=2000):
+    """每种操作重复执行，统计每次操作平均分配的内存（tracemalloc峰值增量）"""
+    rng = random.Random(seed)
+    _, words = max(decks, key=lambda deck: len(deck[1]))
+    session = QuizSession(words, rng=rng)
+    operations = {
+        'options': lambda: session._options_for(session.current_word),
+        'hint': lambda: (session.clear(), setattr(session, 'hint_index', 0), session.hint()),
+        'check_answer': lambda: (session.clear(), session.check_answer()),
+        'add_syllable': lambda: (session.clear(), session.add_syllable(session.syllables()[0])),
+    }
+    results = {}
+    tracemalloc.start()
+    for name, operation in operations.items():
+        operation()
+        tracemalloc.reset_peak()
+        current, _ = tracemalloc.get_traced_memory()
+        peak_total = 0
+        for _ in range(repeat):
+            operation()
+            _, peak = tracemalloc.get_traced_memory()
+            peak_total += peak - current
+            tracemalloc.reset_peak()
+        results[name] = peak_total / repeat
+    tracemalloc.stop()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='答题引擎基准测试')
+    parser.add_argument('--sessions', type=int, default=2000, help='模拟的答题次数（每次完成一个分类）')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        decks = load_decks(cache_dir)
+    if not decks:
+        raise SystemExit('找不到词库，请在项目根目录运行')
+
+    rng = random.Random(args.seed)
+    timings = dict.fromkeys(('options', 'hint', 'check_answer', 'add_syllable', 'prepare_next'), 0.0)
+    counts = dict.fromkeys(timings, 0)
+    started = time.perf_counter()
+    for _ in range(args.sessions):
+        _, words = decks[rng.randrange(len(decks))]
+        play_session(QuizSession(words, rng=rng), rng, timings, counts)
+    elapsed = time.perf_counter() - started
+
+    allocations = measure_allocations(decks, args.seed)
+
+    print(f'{len(decks)} 个分类, {args.sessions} 次答题, 总耗时 {elapsed:.2f} s')
+    print(f'{"操作":<14}{"次数":>10}{"每秒操作数":>14}{"平均耗时(us)":>14}{"平均分配(B)":>14}')
+    for name in timings:
+        ops = counts[name] / timings[name] if timings[name] else 0
+        mean_us = timings[name] / counts[name] * 1e6 if counts[name] else 0
+        allocated = f'{allocations[name]:>14.0f}' if name in allocations else f'{"-":>14}'
+        print(f'{name:<14}{counts[name]:>10}{ops:>14,.0f}{mean_us:>14.2f}{allocated}')
+
+
+if __name__ == '__main__':
+    main()
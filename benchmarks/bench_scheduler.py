@@ -0,0 +1,86 @@
+# 间隔重复调度基准测试 - 在大词库上测量建队列、每次作答（记录+取下一个）以及保存和读取状态的耗时
+#
+# 用法（在项目根目录）: python -m benchmarks.bench_scheduler [--words 50000] [--answers 20000] [--seed 1]
+# 单词由随包词库中的单词加编号生成；先模拟若干天的练习，使大部分单词都有记忆状态且到期时间各不相同
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from quiz import QuizSession
+from scheduler import DAY, Scheduler
+from wordbank import WordBank, WordRecord
+
+WORKBOOK = 'data_four/words_four2.xlsx'
+
+
+def synthetic_words(cache_dir, count):
+    bank = WordBank(WORKBOOK, os.path.join(cache_dir, 'words.bank')).open()
+    templates = [record for name in bank.sheet_names for record in bank.load_sheet(name) or []]
+    words = []
+    for i in range(count):
+        t = templates[i % len(templates)]
+        words.append(WordRecord(f'{t.chinese}{i}', f'{t.word}{i}', f'{t.pronunciation},{i}', t.syllables, t.sound))
+    return words
+
+
+def answer(session, rng):
+    # 大多数单词直接答对，部分选错或使用提示
+    roll = rng.random()
+    if roll < 0.1:
+        session.hint()
+    elif roll < 0.3:
+        session.add_syllable('#')
+        session.clear()
+    for syllable in session.syllables()[session.hint_index:]:
+        session.add_syllable(syllable)
+    while not session.answered:
+        session.hint()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='间隔重复调度基准测试')
+    parser.add_argument('--words', type=int, default=50000)
+    parser.add_argument('--answers', type=int, default=20000, help='计时的作答次数')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as work_dir:
+        words = synthetic_words(work_dir, args.words)
+        path = os.path.join(work_dir, 'schedule.json')
+        scheduler = Scheduler(path)
+
+        # 为所有单词生成分散的到期时间
+        now = time.time()
+        for word in words:
+            scheduler.review(word.word, rng.choice((2, 4, 5)), now - rng.uniform(0, 30) * DAY)
+
+        started = time.perf_counter()
+        session = QuizSession(words, rng=rng, scheduler=scheduler, clock=lambda: now)
+        build_ms = (time.perf_counter() - started) * 1000
+
+        count = min(args.answers, session.total)
+        elapsed = 0.0
+        for _ in range(count):
+            answer(session, rng)
+            started = time.perf_counter()
+            session.advance()
+            elapsed += time.perf_counter() - started
+
+        started = time.perf_counter()
+        scheduler.save()
+        save_ms = (time.perf_counter() - started) * 1000
+        size = os.path.getsize(path)
+        started = time.perf_counter()
+        loaded = Scheduler.load(path)
+        load_ms = (time.perf_counter() - started) * 1000
+
+    print(f'{args.words} 个单词, 本次到期 {session.total} 个, 新建队列(含干扰音节池) {build_ms:.1f} ms')
+    print(f'每次作答记录并取下一个单词: {elapsed / count * 1e6:.2f} us（{count} 次）')
+    print(f'保存 {len(loaded.cards)} 个单词的状态: {save_ms:.1f} ms, {size / 1024:.0f} KB, 读取: {load_ms:.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+# 音频库基准测试 - 比较应用实际的两种播放准备路径：逐个wav文件SoundLoader.load，与从音频库导出再SoundLoader.load
+#
+# 用法（在项目根目录）: python -m benchmarks.bench_sound_bank [--rounds 5]
+# 用data_four/sound2中的原始音频在临时目录中打包，按应用的方式（资源清单 -> SoundIndex.path_for -> SoundLoader.load）测量：
+#   逐个文件：清单中是单独的wav文件，path_for取出路径再load，即不使用音频库时每次播放前的耗时
+#   音频库打开：打开并映射音频库（启动时一次）
+#   后台导出全部：SoundBank.export_all（应用启动后在后台线程中一次）
+#   首次播放：path_for从音频库导出这个音频（写wav文件）再load，即后台还没有导出到它时主线程的耗时
+#   已导出：path_for取出记住的路径再load，即之后每次播放前主线程的耗时
+# kivy的音频后端只能从文件加载，音频库不会让播放更快，这里用来确认它没有明显变慢。
+# 需要kivy（SoundLoader），结果受系统文件缓存影响，各项都是多次运行取最好的一次
+import argparse
+import json
+import os
+import tempfile
+import time
+from types import SimpleNamespace
+
+from sound_bank import write_sound_bank
+from sound_index import SoundIndex
+
+SOUND_DIR = 'data_four/sound2'
+
+
+def best_of(rounds, run, setup=None):
+    best = None
+    for _ in range(rounds):
+        if setup is not None:
+            setup()
+        started = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def load_all(loader, index, words):
+    for word in words:
+        sound = loader(index.path_for(word))
+        if sound is None:
+            raise SystemExit(f'SoundLoader无法加载: {word.sound}')
+        sound.unload()
+
+
+def write_manifest(path, sounds, sound_bank=None):
+    manifest = {'sounds': sounds}
+    if sound_bank:
+        manifest['sound_bank'] = sound_bank
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='音频库基准测试')
+    parser.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args()
+
+    # kivy不解析本脚本的命令行参数，也不输出日志
+    os.environ.setdefault('KIVY_NO_ARGS', '1')
+    os.environ.setdefault('KIVY_NO_CONSOLELOG', '1')
+    from kivy.core.audio import SoundLoader
+
+    loader = SoundLoader.load
+    names = sorted(name for name in os.listdir(SOUND_DIR) if name.lower().endswith('.wav'))
+    paths = [os.path.abspath(os.path.join(SOUND_DIR, name)) for name in names]
+    total_size = sum(os.path.getsize(path) for path in paths)
+    words = [SimpleNamespace(sound=name) for name in names]
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        bank_path = os.path.join(work_dir, 'sounds.pack')
+        write_sound_bank(dict(zip(names, paths)), bank_path)
+        files_manifest = os.path.join(work_dir, 'files.json')
+        write_manifest(files_manifest, dict(zip(names, paths)))
+        bank_manifest = os.path.join(work_dir, 'bank.json')
+        write_manifest(bank_manifest, {name: name for name in names}, 'sounds.pack')
+
+        file_index = SoundIndex.from_manifest(files_manifest)
+        file_time = best_of(args.rounds, lambda: load_all(loader, file_index, words))
+
+        indexes = []
+
+        def open_index():
+            # 每次新建索引并导出到新的目录，测量的是第一次导出
+            indexes.append(SoundIndex.from_manifest(bank_manifest, tempfile.mkdtemp(dir=work_dir)))
+
+        open_time = best_of(args.rounds, open_index)
+        export_all_time = best_of(args.rounds, lambda: indexes[-1].bank.export_all(), setup=open_index)
+        first_time = best_of(args.rounds, lambda: load_all(loader, indexes[-1], words), setup=open_index)
+        exported_time = best_of(args.rounds, lambda: load_all(loader, indexes[-1], words))
+
+        count = len(names)
+        print(f'{count} 个音频, 共 {total_size / 1024:.0f} KB, 音频库 {os.path.getsize(bank_path) / 1024:.0f} KB')
+        print(f'{"方式":<24}{"总耗时(ms)":>12}{"每个音频(µs)":>14}')
+        for name, elapsed, per_clip in (('逐个文件 查找+load', file_time, True),
+                                        ('音频库打开(一次)', open_time, False),
+                                        ('后台导出全部(一次)', export_all_time, False),
+                                        ('首次播放 导出+load', first_time, True),
+                                        ('已导出 查找+load', exported_time, True)):
+            per = f'{elapsed / count * 1e6:>14.1f}' if per_clip else f'{"":>14}'
+            print(f'{name:<24}{elapsed * 1000:>12.2f}{per}')
+
+        for index in indexes:
+            index.bank.close()
+
+
+if __name__ == '__main__':
+    main()
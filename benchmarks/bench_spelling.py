@@ -0,0 +1,146 @@
+# 拼写纠错基准测试 - 比较difflib.get_close_matches逐一比较、BK树和对称删除索引（spelling.py）的查询耗时，
+# 以及应用实际使用的suggest（先按距离1查找，不够时才扩大距离）
+#
+# 用法（在项目根目录）: python -m benchmarks.bench_spelling [--words 50000] [--queries 200] [--seed 1]
+# 词表为两个工作簿中的所有单词，不够时用词库中的音节随机拼接补足；查询为随机改错1-2个字母的单词
+import argparse
+import difflib
+import os
+import random
+import tempfile
+import time
+
+from spelling import SpellingIndex, _char_masks, _distance
+from wordbank import WordBank
+
+WORKBOOKS = ('data_four/words_four2.xlsx', 'data_four/words_four.xlsx')
+
+
+class BKTree:
+    """作为对比的BK树：每个节点为[单词, {与子节点单词的距离: 子节点}]"""
+
+    def __init__(self, words):
+        self.root = None
+        for word in words:
+            self.add(word)
+
+    def add(self, word):
+        if self.root is None:
+            self.root = [word, {}]
+            return
+        masks, length = _char_masks(word), len(word)
+        node = self.root
+        while True:
+            distance = _distance(masks, length, node[0])
+            if distance == 0:
+                return
+            child = node[1].get(distance)
+            if child is None:
+                node[1][distance] = [word, {}]
+                return
+            node = child
+
+    def search(self, word, max_distance):
+        masks, length = _char_masks(word), len(word)
+        found = []
+        stack = [self.root]
+        while stack:
+            candidate, children = stack.pop()
+            distance = _distance(masks, length, candidate)
+            if distance <= max_distance:
+                found.append((distance, candidate))
+            stack.extend(child for key, child in children.items()
+                         if distance - max_distance <= key <= distance + max_distance)
+        found.sort()
+        return found
+
+
+def load_vocabulary():
+    words = set()
+    parts = set()
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for path in WORKBOOKS:
+            if not os.path.exists(path):
+                continue
+            bank = WordBank(path, os.path.join(cache_dir, os.path.basename(path) + '.bank')).open()
+            for name in bank.sheet_names:
+                for record in bank.load_sheet(name) or []:
+                    words.add(record.word.strip().lower())
+                    parts.update(record.parts)
+    # 只用纯字母的音节拼接补充的单词
+    return words, sorted(part.lower() for part in parts if part.isalpha())
+
+
+def misspell(word, rng, alphabet='abcdefghijklmnopqrstuvwxyz'):
+    chars = list(word)
+    for _ in range(rng.choice((1, 1, 2))):
+        position = rng.randrange(len(chars) + 1)
+        operation = rng.choice(('insert', 'delete', 'replace')) if chars else 'insert'
+        if operation == 'insert':
+            chars.insert(position, rng.choice(alphabet))
+        elif operation == 'delete':
+            del chars[min(position, len(chars) - 1)]
+        else:
+            chars[min(position, len(chars) - 1)] = rng.choice(alphabet)
+    return ''.join(chars)
+
+
+def time_queries(queries, lookup):
+    durations = []
+    for query in queries:
+        started = time.perf_counter()
+        lookup(query)
+        durations.append(time.perf_counter() - started)
+    durations.sort()
+    return sum(durations) / len(durations), durations[int(len(durations) * 0.95)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='拼写纠错基准测试')
+    parser.add_argument('--words', type=int, default=50000, help='词表大小')
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--distance', type=int, default=2, help='最大编辑距离')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    vocabulary, parts = load_vocabulary()
+    if not vocabulary:
+        raise SystemExit('找不到词库，请在项目根目录运行')
+    real_words = sorted(vocabulary)
+    while len(vocabulary) < args.words:
+        vocabulary.add(''.join(rng.choice(parts) for _ in range(rng.randint(2, 4))))
+    words = sorted(vocabulary)
+    queries = [misspell(rng.choice(real_words), rng) for _ in range(args.queries)]
+
+    started = time.perf_counter()
+    index = SpellingIndex(words, args.distance)
+    index_build = time.perf_counter() - started
+    started = time.perf_counter()
+    tree = BKTree(words)
+    tree_build = time.perf_counter() - started
+
+    # 两种索引的结果必须完全一致
+    for query in queries:
+        if index.search(query) != tree.search(query, args.distance):
+            raise SystemExit(f'结果不一致: {query}')
+
+    # difflib按相似度比例而不是编辑距离，只作为逐一比较的耗时参考，取较少的查询
+    results = (
+        ('difflib', None, time_queries(queries[:max(1, len(queries) // 10)],
+                                       lambda query: difflib.get_close_matches(query, words, n=3))),
+        ('BK树', tree_build, time_queries(queries, lambda query: tree.search(query, args.distance))),
+        ('对称删除索引', index_build, time_queries(queries, index.search)),
+        ('suggest', None, time_queries(queries, index.suggest)),
+    )
+
+    print(f'词表 {len(words)} 个单词（词库中 {len(real_words)} 个）, 查询 {len(queries)} 次, '
+          f'最大编辑距离 {args.distance}, 索引 {index.nbytes / 1024 / 1024:.1f} MB')
+    print(f'{"方法":<12}{"建立(s)":>10}{"平均(ms)":>12}{"p95(ms)":>12}')
+    for name, build_time, (mean, p95) in results:
+        build_text = f'{build_time:.2f}' if build_time is not None else '-'
+        print(f'{name:<12}{build_text:>10}{mean * 1000:>12.3f}{p95 * 1000:>12.3f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+# SQLite词库基准测试 - 与预编译词库比较读取分类、统计分类单词数，以及跨工作簿按音节查询的耗时
+#
+# 用法（在项目根目录）: python -m benchmarks.bench_sqlite_store [--rounds 200]
+# 在临时目录中用两个工作簿生成预编译词库和SQLite词库（不做build_assets.py的校验）
+import argparse
+import os
+import tempfile
+import time
+
+from sqlite_store import WordStore, build_word_store
+from wordbank import WordBank, file_fingerprint, read_workbook_sheets
+
+WORKBOOKS = ('data_four/words_four2.xlsx', 'data_four/words_four.xlsx')
+
+
+def best_of(rounds, run):
+    best = None
+    for _ in range(rounds):
+        started = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def scan_syllable(banks, syllable):
+    # 没有索引时只能读取所有工作簿的所有分类
+    found = []
+    for bank in banks:
+        for name in bank.sheet_names:
+            found.extend(word for word in bank.load_sheet(name) or [] if syllable in word.parts)
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description='SQLite词库基准测试')
+    parser.add_argument('--rounds', type=int, default=200)
+    parser.add_argument('--syllable', default='er')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        banks = [WordBank(path, os.path.join(work_dir, os.path.basename(path) + '.bank')).open()
+                 for path in WORKBOOKS]
+        db_path = os.path.join(work_dir, 'words.db')
+        build_word_store([(path, file_fingerprint(path), read_workbook_sheets(path)) for path in WORKBOOKS], db_path)
+        store = WordStore.open(db_path, WORKBOOKS[0])
+        bank = banks[0]
+        largest = max(bank.category_counts().items(), key=lambda item: item[1])[0]
+
+        results = (
+            (f'读取分类 {largest}', best_of(args.rounds, lambda: bank.load_sheet(largest)),
+             best_of(args.rounds, lambda: store.load_sheet(largest))),
+            ('读取一页(20个)', best_of(args.rounds, lambda: bank.load_sheet(largest)[:20]),
+             best_of(args.rounds, lambda: store.load_sheet(largest, 0, 20))),
+            ('分类单词数', best_of(args.rounds, bank.category_counts),
+             best_of(args.rounds, store.category_counts)),
+            (f'含音节 {args.syllable} 的单词', best_of(args.rounds, lambda: scan_syllable(banks, args.syllable)),
+             best_of(args.rounds, lambda: store.words_with_syllable(args.syllable))),
+        )
+        matches = len(store.words_with_syllable(args.syllable))
+        store.close()
+
+    print(f'SQLite词库 {os.path.basename(db_path)}: 含音节 {args.syllable} 的单词 {matches} 个')
+    print(f'{"操作":<20}{"预编译词库(us)":>16}{"SQLite(us)":>14}')
+    for name, bank_time, store_time in results:
+        print(f'{name:<20}{bank_time * 1e6:>16.1f}{store_time * 1e6:>14.1f}')
+
+
+if __name__ == '__main__':
+    main()
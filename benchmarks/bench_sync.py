@@ -0,0 +1,133 @@
+# 进度同步压力测试 - 在本机启动同步服务器，模拟全班（数百台）设备同时答题并上传
+#
+# 用法（在项目根目录）: python -m benchmarks.bench_sync [--devices 200] [--events 100] [--fail-rate 0.1]
+# 每台设备一个SyncClient，按随机间隔记录答题事件，结束时关闭客户端；--fail-rate按比例让服务器返回503，
+# 检查重试和去重后服务器收到的事件数与发出的完全一致。--url可以指向已经运行的服务器（此时不检查事件数）
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+
+from sync_client import SyncClient
+from sync_server import SyncRequestHandler, SyncServer
+
+WORDS = ('apple', 'banana', 'teacher', 'student', 'weather', 'sweater', 'trousers', 'uniform')
+
+
+class TimedSyncClient(SyncClient):
+    """记录每次上传请求的耗时"""
+
+    def __init__(self, *args, latencies, lock, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._latencies = latencies
+        self._lock = lock
+
+    def _post(self, body):
+        started = time.perf_counter()
+        try:
+            return super()._post(body)
+        finally:
+            with self._lock:
+                self._latencies.append(time.perf_counter() - started)
+
+
+def flaky_handler(fail_rate, seed):
+    rng = random.Random(seed)
+    lock = threading.Lock()
+
+    class FlakyHandler(SyncRequestHandler):
+        def do_POST(self):
+            with lock:
+                fail = rng.random() < fail_rate
+            if not fail:
+                super().do_POST()
+                return
+            self._discard_body()
+            self.send_response(503)
+            self.send_header('Retry-After', '0')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+
+    return FlakyHandler
+
+
+def run_device(client, events, rng, think_time):
+    client.start()
+    for _ in range(events):
+        client.record_answer(rng.choice(WORDS), 'Unit1', rng.randint(1, 5), rng.randint(0, 2), 0, False)
+        if think_time:
+            time.sleep(rng.uniform(0, think_time))
+    # 等待按正常的间隔和退避上传完，而不是由close()只尝试一次
+    deadline = time.monotonic() + 60
+    while client.pending and time.monotonic() < deadline:
+        time.sleep(0.05)
+    client.close(timeout=60)
+
+
+def percentile(values, p):
+    return values[min(len(values) - 1, int(len(values) * p / 100))] if values else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='进度同步压力测试')
+    parser.add_argument('--devices', type=int, default=200)
+    parser.add_argument('--events', type=int, default=100, help='每台设备的答题事件数')
+    parser.add_argument('--batch-size', type=int, default=20)
+    parser.add_argument('--think-time', type=float, default=0.01, help='两次答题之间的最大间隔（秒）')
+    parser.add_argument('--fail-rate', type=float, default=0.0, help='服务器返回503的比例')
+    parser.add_argument('--url', help='已经运行的同步服务器，不指定时在本机启动一个')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        server = None
+        url = args.url
+        if url is None:
+            server = SyncServer(('127.0.0.1', 0), os.path.join(work_dir, 'sync.db'),
+                                handler=flaky_handler(args.fail_rate, args.seed))
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            url = f'http://127.0.0.1:{server.server_address[1]}'
+
+        latencies = []
+        lock = threading.Lock()
+        clients = [TimedSyncClient(url, f'device-{i:04d}', 'bench', batch_size=args.batch_size,
+                                   flush_interval=0.5, initial_backoff=0.05, max_backoff=1.0,
+                                   rng=random.Random(args.seed + i), latencies=latencies, lock=lock)
+                   for i in range(args.devices)]
+        threads = [threading.Thread(target=run_device,
+                                    args=(client, args.events, random.Random(args.seed * 7919 + i), args.think_time))
+                   for i, client in enumerate(clients)]
+
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        sent = sum(client.stats['events'] for client in clients)
+        retries = sum(client.stats['retries'] for client in clients)
+        dropped = sum(client.stats['dropped'] + client.pending for client in clients)
+        stored = None
+        if server is not None:
+            stored = server.store.count()
+            server.shutdown()
+            server.server_close()
+
+    latencies.sort()
+    print(f'{args.devices} 台设备 x {args.events} 个事件, 每批 {args.batch_size} 个, 服务器失败率 {args.fail_rate:.0%}')
+    print(f'耗时 {elapsed:.2f} s, 上传 {sent} 个事件（{sent / elapsed:,.0f} 个/秒）, '
+          f'请求 {len(latencies)} 次, 重试 {retries} 次, 未上传 {dropped} 个')
+    print(f'请求耗时(ms): p50 {percentile(latencies, 50) * 1000:.1f}  p95 {percentile(latencies, 95) * 1000:.1f}  '
+          f'p99 {percentile(latencies, 99) * 1000:.1f}  最大 {latencies[-1] * 1000 if latencies else 0:.1f}')
+    if stored is not None:
+        expected = args.devices * args.events
+        print(f'服务器保存 {stored} 个事件' + ('' if stored == expected else f'，应为 {expected} 个'))
+        if stored != expected:
+            raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
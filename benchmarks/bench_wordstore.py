@@ -0,0 +1,82 @@
+# 词库内存占用基准测试 - 比较每个单词一个字典与WordRecord（__slots__ + 字符串驻留）的内存占用
+#
+# 用法（在项目根目录）: python -m benchmarks.bench_wordstore [--words 10000]
+# 以随包词库中的单词为模板生成指定数量的单词（单词、中文、音频互不相同，音节沿用真实数据），
+# 模拟从词库文件解码后的结果，统计每种存储方式保留的内存
+import argparse
+import gc
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+from wordbank import COLUMNS, WordBank, WordRecord
+
+WORKBOOKS = ('data_four/words_four2.xlsx', 'data_four/words_four.xlsx')
+
+
+def template_rows(cache_dir):
+    rows = []
+    for path in WORKBOOKS:
+        bank = WordBank(path, os.path.join(cache_dir, os.path.basename(path) + '.bank')).open()
+        for name in bank.sheet_names:
+            for record in bank.load_sheet(name) or []:
+                rows.append([getattr(record, col) for col in COLUMNS])
+    return rows
+
+
+def synthetic_rows(templates, count):
+    rows = []
+    for i in range(count):
+        chinese, word, pronunciation, syllables, sound = templates[i % len(templates)]
+        rows.append([f'{chinese}{i}', f'{word}{i}', pronunciation, syllables, f'{sound}{i}'])
+    return rows
+
+
+def as_dicts(rows):
+    # 原来的存储方式：每行一个字典，每次使用时再拆分pronunciation
+    return [dict(zip(COLUMNS, row)) for row in rows]
+
+
+def as_records(rows):
+    return [WordRecord(*row) for row in rows]
+
+
+def measure(encoded, build):
+    # 耗时单独测量，避免tracemalloc本身的开销
+    rows = json.loads(encoded)
+    started = time.perf_counter()
+    build(rows)
+    elapsed = time.perf_counter() - started
+    # 释放未跟踪的数据，否则驻留字符串会复用这些对象而被少算
+    del rows
+
+    gc.collect()
+    tracemalloc.start()
+    store = build(json.loads(encoded))
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return store, retained, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='词库内存占用基准测试')
+    parser.add_argument('--words', type=int, default=10000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        templates = template_rows(cache_dir)
+    encoded = json.dumps(synthetic_rows(templates, args.words), ensure_ascii=False)
+
+    print(f'{args.words} 个单词（模板 {len(templates)} 个）')
+    print(f'{"存储方式":<12}{"总内存(KB)":>14}{"每个单词(B)":>14}{"构建耗时(ms)":>14}')
+    for name, build in (('dict', as_dicts), ('WordRecord', as_records)):
+        store, retained, elapsed = measure(encoded, build)
+        print(f'{name:<12}{retained / 1024:>14.0f}{retained / len(store):>14.0f}{elapsed * 1000:>14.1f}')
+        del store
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,425 @@
+# 离线资源构建 - 校验词库与音频的一致性，生成运行时使用的预编译词库和资源清单
+#
+# 用法（在项目根目录）:
+#   python build_assets.py [--workbook data_four/words_four2.xlsx ...] [--out data_four] [--strict]
+#
+# 校验发现错误时以非零状态退出，不生成或覆盖任何文件（所有文件先写入输出目录中的临时目录，成功后才移动到位）；
+# 应用运行时直接使用这里生成的结果，不再做校验。
+# 单词用到的音频会统一格式并裁掉首尾静音（见audio_build.py），输出到 <输出目录>/audio，并打印每个文件的报告。
+# 指定--font时把中文字体裁剪为只包含词库和界面用到的字符（见font_build.py），输出到 <输出目录>/fonts。
+# 指定--atlas时把界面图片按密度档位打包为kivy图集（见image_build.py），输出到 <输出目录>/images。
+# 错误：缺少必要的列、单词或音节为空、音节拼起来不是单词、标准库读取器与pandas结果不一致
+# 警告（--strict时视为错误）：找不到音频文件、同一分类中单词重复、分类加载耗时超出预算或明显变慢
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import wave
+
+import audio_build
+import font_build
+import image_build
+from fonts import BUNDLED_FONT
+from sound_bank import write_sound_bank
+from sqlite_store import build_word_store
+from ui_images import ATLAS_DIR
+from sound_index import SOUND_DIRS, SoundIndex
+from wordbank import (COLUMNS, WordBank, WordRecord, compile_workbook, file_fingerprint, file_sha1,
+                      read_workbook_sheets, read_workbook_sheets_pandas)
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+MANIFEST_NAME = 'manifest.json'
+MANIFEST_VERSION = 1
+
+DEFAULT_WORKBOOKS = ('data_four/words_four2.xlsx',)
+IMAGE_DIRS = ('data/image',)
+# 处理后的音频输出到输出目录下的该子目录，按源目录名分开存放
+AUDIO_DIR = 'audio'
+# 打包的音频库文件名（--sound-bank）
+SOUND_BANK_NAME = 'sounds.pack'
+# SQLite词库文件名（--sqlite）
+WORD_STORE_NAME = 'words.db'
+
+# 单个分类从词库加载的耗时预算（毫秒）
+DEFAULT_LOAD_BUDGET_MS = 5.0
+# 与上次构建相比，加载耗时增长超过该倍数时给出警告
+SLOWDOWN_FACTOR = 2.0
+
+
+class BuildReport:
+    def __init__(self):
+        self.errors = []
+        self.warnings = []
+
+    def error(self, message):
+        self.errors.append(message)
+
+    def warning(self, message):
+        self.warnings.append(message)
+
+    def print(self):
+        for message in self.warnings:
+            print(f'警告: {message}')
+        for message in self.errors:
+            print(f'错误: {message}')
+
+
+def sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def relative(path, base):
+    return os.path.relpath(path, base).replace(os.sep, '/')
+
+
+def read_sheets(workbook, source, report):
+    """用pandas读取所有工作表，并确认运行时的标准库读取器得到完全相同的数据"""
+    expected = read_workbook_sheets_pandas(workbook)
+    actual = read_workbook_sheets(workbook)
+    for (name, rows), (_, stream_rows) in zip(expected, actual):
+        if rows != stream_rows:
+            report.error(f'{source} [{name}]: 标准库读取器与pandas结果不一致')
+    if [name for name, _ in expected] != [name for name, _ in actual]:
+        report.error(f'{source}: 标准库读取器读到的工作表与pandas不一致')
+    return expected
+
+
+def validate_sheet(source, name, rows, sound_index, report):
+    where = f'{source} [{name}]'
+    if rows is None:
+        report.error(f'{where}: 缺少必要的列，需要的列: {list(COLUMNS)}')
+        return
+
+    seen = set()
+    for line, row in enumerate(rows, start=2):  # 第1行是表头
+        record = WordRecord(*row)
+        if not record.word:
+            report.error(f'{where} 第{line}行: 单词为空')
+            continue
+        if not record.parts:
+            report.error(f'{where} 第{line}行: {record.word} 没有音节(pronunciation)')
+        elif ''.join(record.parts) != record.word:
+            report.error(f'{where} 第{line}行: 音节 {record.pronunciation!r} 拼起来不是单词 {record.word!r}')
+        if record.word in seen:
+            report.warning(f'{where} 第{line}行: 单词 {record.word} 重复')
+        seen.add(record.word)
+        if not record.sound:
+            report.warning(f'{where} 第{line}行: {record.word} 没有音频(sound)')
+        elif sound_index.path_for(record) is None:
+            report.warning(f'{where} 第{line}行: 找不到音频文件 {record.sound}')
+
+
+def measure_load_times(workbook, bank_path, repeat=3):
+    """测量每个分类从词库加载的耗时（毫秒，取最好的一次）"""
+    bank = WordBank(workbook, bank_path).open()
+    times = {}
+    for name in bank.sheet_names:
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            bank.load_sheet(name)
+            elapsed = (time.perf_counter() - started) * 1000
+            best = elapsed if best is None else min(best, elapsed)
+        times[name] = round(best, 3)
+    return times
+
+
+def load_previous_manifest(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def asset_entry(path, base):
+    return {'path': relative(path, base), 'size': os.path.getsize(path), 'sha256': sha256(path)}
+
+
+def process_audio(paths, out_dir, rate, report):
+    """裁剪并统一音频格式，返回{源文件路径: 处理后的路径}和每个文件的报告"""
+    processed = {}
+    audio_report = {}
+    for source in sorted(paths):
+        target = os.path.join(out_dir, AUDIO_DIR, os.path.basename(os.path.dirname(source)),
+                              os.path.basename(source))
+        try:
+            audio_report[relative(target, out_dir)] = audio_build.process_file(source, target, rate)
+        except (wave.Error, EOFError) as e:
+            report.error(f'无法处理音频文件 {relative(source, ROOT)}: {e}')
+            continue
+        processed[source] = target
+    return processed, audio_report
+
+
+def print_audio_report(audio_report):
+    for path, entry in audio_report.items():
+        print(f"{path}: {entry['source_size'] / 1024:.0f} KB -> {entry['size'] / 1024:.0f} KB, "
+              f"开头裁掉 {entry['lead_trimmed_ms']:.0f} ms, 结尾裁掉 {entry['trail_trimmed_ms']:.0f} ms, "
+              f"读取 {entry['source_read_ms']:.2f} ms -> {entry['read_ms']:.2f} ms")
+    if audio_report:
+        entries = audio_report.values()
+        source_size = sum(entry['source_size'] for entry in entries)
+        size = sum(entry['size'] for entry in entries)
+        lead = sum(entry['lead_trimmed_ms'] for entry in entries) / len(audio_report)
+        print(f'音频: {len(audio_report)} 个文件, {source_size / 1024:.0f} KB -> {size / 1024:.0f} KB, '
+              f'平均开头延迟减少 {lead:.0f} ms')
+
+
+def install_staged(staging, out_dir):
+    """把临时目录中生成的文件移动到输出目录中对应的位置"""
+    for directory, _, names in os.walk(staging):
+        target_dir = os.path.join(out_dir, os.path.relpath(directory, staging))
+        os.makedirs(target_dir, exist_ok=True)
+        for name in names:
+            os.replace(os.path.join(directory, name), os.path.join(target_dir, name))
+
+
+def build(workbooks, out_dir, strict=False, load_budget_ms=DEFAULT_LOAD_BUDGET_MS,
+          audio=True, sample_rate=audio_build.TARGET_RATE, sound_bank=False, word_store=False,
+          font=None, font_number=0, atlas=False):
+    """执行构建，返回退出状态"""
+    os.makedirs(out_dir, exist_ok=True)
+    # 生成的文件先写入输出目录中的临时目录（同一文件系统，可以直接移动），全部成功后才移动到位
+    staging = tempfile.mkdtemp(prefix='.build-', dir=out_dir)
+    try:
+        return _build(workbooks, out_dir, staging, strict, load_budget_ms, audio, sample_rate, sound_bank,
+                      word_store, font, font_number, atlas)
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+
+def _build(workbooks, out_dir, staging, strict, load_budget_ms, audio, sample_rate, sound_bank, word_store,
+           font, font_number, atlas):
+    # 生成的文件在清单中的路径相对于staging（移动后即相对于out_dir），原始文件相对于out_dir
+    report = BuildReport()
+    sound_index = SoundIndex.scan([os.path.join(ROOT, directory) for directory in SOUND_DIRS])
+
+    # 第一步：读取并校验所有工作簿，有错误时不生成任何文件
+    decks = []
+    for workbook in workbooks:
+        if not os.path.exists(workbook):
+            report.error(f'找不到工作簿: {workbook}')
+            continue
+        source = relative(workbook, ROOT)
+        sheets = read_sheets(workbook, source, report)
+        for name, rows in sheets:
+            validate_sheet(source, name, rows, sound_index, report)
+        decks.append((workbook, sheets))
+
+    if report.errors or (strict and report.warnings):
+        report.print()
+        print(f'构建失败: {len(report.errors)} 个错误, {len(report.warnings)} 个警告')
+        return 1
+
+    # 第二步：生成预编译词库，并测量每个分类的加载耗时
+    manifest_path = os.path.join(out_dir, MANIFEST_NAME)
+    previous = {deck['source']: deck for deck in load_previous_manifest(manifest_path).get('decks', [])}
+    manifest = {'version': MANIFEST_VERSION, 'decks': [], 'sounds': {}, 'missing_sounds': [], 'assets': [],
+                'audio': {}}
+
+    for workbook, sheets in decks:
+        source = relative(workbook, ROOT)
+        bank_path = os.path.join(staging, os.path.splitext(os.path.basename(workbook))[0] + '.bank')
+        compile_workbook(workbook, bank_path, reader=lambda path: sheets)
+        load_times = measure_load_times(workbook, bank_path)
+
+        old_times = previous.get(source, {}).get('load_ms', {})
+        for name, load_ms in load_times.items():
+            if load_ms > load_budget_ms:
+                report.warning(f'{source} [{name}]: 加载耗时 {load_ms:.2f} ms，超出预算 {load_budget_ms} ms')
+            old_ms = old_times.get(name)
+            if old_ms and load_ms > old_ms * SLOWDOWN_FACTOR:
+                report.warning(f'{source} [{name}]: 加载耗时从 {old_ms:.2f} ms 增加到 {load_ms:.2f} ms')
+
+        manifest['decks'].append({
+            'source': source,
+            'sha1': file_sha1(workbook),
+            'bank': relative(bank_path, staging),
+            'counts': {name: len(rows) for name, rows in sheets if rows is not None},
+            'load_ms': load_times
+        })
+        manifest['assets'].append(asset_entry(bank_path, staging))
+
+        # 音频路径在构建时解析好，应用启动时直接读取，不再扫描目录
+        for _, rows in sheets:
+            for row in rows or []:
+                record = WordRecord(*row)
+                if not record.sound or record.sound in manifest['sounds']:
+                    continue
+                path = sound_index.path_for(record)
+                manifest['sounds'][record.sound] = path
+                if path is None:
+                    manifest['missing_sounds'].append(record.sound)
+
+    if word_store:
+        # 所有工作簿放在同一个SQLite词库中，可以跨工作簿查询
+        store_path = os.path.join(staging, WORD_STORE_NAME)
+        build_word_store([(relative(workbook, ROOT), file_fingerprint(workbook), sheets)
+                          for workbook, sheets in decks], store_path)
+        manifest['word_store'] = relative(store_path, staging)
+        manifest['assets'].append(asset_entry(store_path, staging))
+
+    if font:
+        # 字体只保留词库和界面用到的字符
+        font_path = os.path.join(staging, os.path.relpath(BUNDLED_FONT, 'data_four'))
+        characters = font_build.collect_characters(
+            (row for _, sheets in decks for _, rows in sheets for row in rows or ()),
+            [os.path.join(ROOT, path) for path in font_build.UI_SOURCES])
+        try:
+            manifest['font'] = font_build.subset_font(font, font_path, characters, font_number)
+        except ImportError:
+            report.error('字体子集化需要fontTools: pip install fonttools')
+        except Exception as e:
+            report.error(f'无法处理字体 {font}: {e}')
+        else:
+            manifest['font']['path'] = relative(font_path, staging)
+            manifest['assets'].append(asset_entry(font_path, staging))
+            if manifest['font']['missing']:
+                report.warning(f"字体 {font} 中没有这些字符: {manifest['font']['missing']}")
+            print(f"字体: {manifest['font']['source']} {manifest['font']['source_size'] / 1024:.0f} KB -> "
+                  f"{os.path.join(out_dir, manifest['font']['path'])} {manifest['font']['size'] / 1024:.0f} KB（{manifest['font']['glyphs']} 个字形）")
+
+    asset_dirs = IMAGE_DIRS
+    if atlas:
+        # 界面图片按密度档位打包为图集
+        sources = {}
+        for directory in IMAGE_DIRS:
+            directory = os.path.join(ROOT, directory)
+            for entry in sorted(os.scandir(directory), key=lambda entry: entry.name):
+                if entry.is_file() and entry.name.lower().endswith('.png'):
+                    sources[os.path.splitext(entry.name)[0]] = entry.path
+        atlas_dir = os.path.join(staging, os.path.relpath(ATLAS_DIR, 'data_four'))
+        try:
+            atlases = image_build.build_density_atlases(sources, atlas_dir)
+        except ImportError:
+            report.error('生成图集需要Pillow: pip install pillow')
+        except (OSError, ValueError) as e:
+            report.error(f'无法生成图集: {e}')
+        else:
+            # 对比基准：不使用图集时每张原图单独作为纹理
+            original_size = sum(os.path.getsize(path) for path in sources.values())
+            baseline_gpu = image_build.source_gpu_bytes(sources)
+            print(f'图集: {len(sources)} 张图片（原图 {original_size / 1024:.0f} KB, 显存 {baseline_gpu / 1024:.0f} KB）')
+            manifest['atlases'] = {'baseline': {'size': original_size, 'gpu_bytes': baseline_gpu}}
+            for bucket, info in atlases.items():
+                manifest['assets'].append(asset_entry(info['atlas'], staging))
+                manifest['assets'].append(asset_entry(info['page'], staging))
+                manifest['atlases'][bucket] = {'atlas': relative(info['atlas'], staging), 'texture': info['texture'],
+                                               'size': info['size'], 'gpu_bytes': info['gpu_bytes']}
+                print(f"  {bucket:<8}{info['texture'][0]}x{info['texture'][1]}  "
+                      f"{info['size'] / 1024:.0f} KB（{info['size'] / original_size:.0%}）  "
+                      f"显存 {info['gpu_bytes'] / 1024:.0f} KB（{info['gpu_bytes'] / baseline_gpu:.0%}）")
+            # 原图已经打包进图集，不再列入清单
+            asset_dirs = ()
+
+    # 第三步：处理单词用到的音频，清单中的音频路径指向处理后的文件
+    if audio:
+        used = {path for path in manifest['sounds'].values() if path}
+        processed, manifest['audio'] = process_audio(used, staging, sample_rate, report)
+        manifest['sounds'] = {value: relative(processed[path], staging) if path in processed else None
+                              for value, path in manifest['sounds'].items()}
+        for target in sorted(processed.values()):
+            manifest['assets'].append(asset_entry(target, staging))
+    else:
+        asset_dirs = SOUND_DIRS + asset_dirs
+        manifest['sounds'] = {value: relative(path, out_dir) if path else None
+                              for value, path in manifest['sounds'].items()}
+
+    if sound_bank:
+        # 所有用到的音频打包为一个文件，键与清单中的音频路径相同
+        bank_path = os.path.join(staging, SOUND_BANK_NAME)
+        # 处理后的音频还在临时目录中，不处理音频时为原始文件
+        clip_dir = staging if audio else out_dir
+        clips = {path: os.path.join(clip_dir, path) for path in manifest['sounds'].values() if path}
+        try:
+            header = write_sound_bank(clips, bank_path)
+        except (wave.Error, EOFError) as e:
+            report.error(f'无法打包音频: {e}')
+        else:
+            manifest['sound_bank'] = relative(bank_path, staging)
+            # 单独的音频文件不再随安装包发布：处理后的音频不移动到输出目录，原始音频目录不列入清单
+            packed = set(clips)
+            manifest['assets'] = [asset for asset in manifest['assets'] if asset['path'] not in packed]
+            if audio:
+                shutil.rmtree(os.path.join(staging, AUDIO_DIR), ignore_errors=True)
+            else:
+                asset_dirs = tuple(directory for directory in asset_dirs if directory not in SOUND_DIRS)
+            manifest['assets'].append(asset_entry(bank_path, staging))
+            print(f"音频库: {os.path.join(out_dir, SOUND_BANK_NAME)}（{len(header['clips'])} 个音频, "
+                  f"{os.path.getsize(bank_path) / 1024:.0f} KB）")
+
+    # 资源清单：音频和图片的大小与哈希
+    for directory in asset_dirs:
+        directory = os.path.join(ROOT, directory)
+        if not os.path.isdir(directory):
+            continue
+        for entry in sorted(os.scandir(directory), key=lambda entry: entry.name):
+            if entry.is_file() and not entry.name.startswith('.'):
+                manifest['assets'].append(asset_entry(entry.path, out_dir))
+
+    if report.errors or (strict and report.warnings):
+        report.print()
+        print(f'构建失败: {len(report.errors)} 个错误, {len(report.warnings)} 个警告')
+        return 1
+
+    # 没有错误：生成的文件移动到位，最后写入清单
+    install_staged(staging, out_dir)
+    if 'sound_bank' in manifest:
+        # 以前不使用音频库时生成的单独音频也会被打进安装包
+        shutil.rmtree(os.path.join(out_dir, AUDIO_DIR), ignore_errors=True)
+    tmp_path = manifest_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+    os.replace(tmp_path, manifest_path)
+
+    report.print()
+    print_audio_report(manifest['audio'])
+    for deck in manifest['decks']:
+        print(f"{deck['source']} -> {deck['bank']}: "
+              + ', '.join(f'{name} {count} 个单词' for name, count in deck['counts'].items()))
+    total_size = sum(asset['size'] for asset in manifest['assets'])
+    print(f"资源清单: {manifest_path}（{len(manifest['assets'])} 个文件, {total_size / 1024:.0f} KB, "
+          f"缺少音频 {len(manifest['missing_sounds'])} 个）")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='校验并生成运行时使用的词库和资源清单')
+    parser.add_argument('--workbook', action='append', help='要构建的工作簿，可以指定多次')
+    parser.add_argument('--out', default='data_four', help='输出目录（预编译词库和manifest.json）')
+    parser.add_argument('--strict', action='store_true', help='把警告也视为错误')
+    parser.add_argument('--load-budget-ms', type=float, default=DEFAULT_LOAD_BUDGET_MS,
+                        help='单个分类加载耗时预算（毫秒）')
+    parser.add_argument('--no-audio', dest='audio', action='store_false',
+                        help='不处理音频，清单直接引用原始音频文件')
+    parser.add_argument('--sample-rate', type=int, default=audio_build.TARGET_RATE,
+                        help='处理后音频的采样率')
+    parser.add_argument('--sound-bank', action='store_true',
+                        help=f'把所有音频打包为一个内存映射的音频库（{SOUND_BANK_NAME}）')
+    parser.add_argument('--font', help='要子集化的中文字体（ttf/otf/ttc），需要fontTools')
+    parser.add_argument('--font-number', type=int, default=0, help='ttc字体集中要使用的字体序号')
+    parser.add_argument('--atlas', action='store_true',
+                        help='把界面图片按屏幕密度档位打包为kivy图集，需要Pillow')
+    parser.add_argument('--sqlite', dest='word_store', action='store_true',
+                        help=f'同时生成带索引的SQLite词库（{WORD_STORE_NAME}）')
+    args = parser.parse_args(argv)
+
+    workbooks = args.workbook or [os.path.join(ROOT, workbook) for workbook in DEFAULT_WORKBOOKS]
+    return build(workbooks, args.out, strict=args.strict, load_budget_ms=args.load_budget_ms,
+                 audio=args.audio, sample_rate=args.sample_rate, sound_bank=args.sound_bank,
+                 word_store=args.word_store, font=args.font, font_number=args.font_number,
+                 atlas=args.atlas)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
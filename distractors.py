@@ -0,0 +1,73 @@
+# 干扰选项生成器 - 每个分类建立一次去重后的音节池，每个单词只需O(k)抽取k个干扰项
+#
+# 近似音节索引：按音节长度和包含的字母分桶，需要"容易混淆"的干扰项时从正确音节所在的桶中抽取
+import random
+from collections import Counter
+
+# 拒绝采样的最大尝试倍数，超过后退回到线性筛选
+MAX_ATTEMPT_FACTOR = 8
+
+
+class DistractorPool:
+    def __init__(self, syllables=()):
+        self.counts = Counter(syllables)
+        self.pool = list(self.counts)
+        self._by_length = {}
+        self._by_letter = {}
+        for syllable in self.pool:
+            self._by_length.setdefault(len(syllable), []).append(syllable)
+            for letter in set(syllable.lower()):
+                self._by_letter.setdefault(letter, []).append(syllable)
+
+    @classmethod
+    def from_words(cls, words):
+        syllables = []
+        for word in words:
+            syllables.extend(word.parts)
+        return cls(syllables)
+
+    def __len__(self):
+        return len(self.pool)
+
+    def _draw(self, buckets, k, excluded, chosen, rng):
+        # 从若干个桶中随机抽取，直到选够k个或尝试次数用完
+        attempts = MAX_ATTEMPT_FACTOR * max(k, 1)
+        while len(chosen) < k and attempts > 0 and buckets:
+            attempts -= 1
+            bucket = buckets[rng.randrange(len(buckets))]
+            syllable = bucket[rng.randrange(len(bucket))]
+            if syllable not in excluded and syllable not in chosen:
+                chosen[syllable] = None
+
+    def sample(self, k, exclude=(), rng=random, confusable=False):
+        """抽取k个互不相同、且不在exclude中的干扰音节
+
+        confusable为True时优先从与exclude中的音节长度相同或有共同字母的音节中抽取。
+        """
+        excluded = set(exclude)
+        chosen = {}  # 用dict保持抽取顺序
+        if k <= 0 or not self.pool:
+            return []
+
+        if confusable and excluded:
+            buckets = []
+            for syllable in excluded:
+                bucket = self._by_length.get(len(syllable))
+                if bucket:
+                    buckets.append(bucket)
+                for letter in set(syllable.lower()):
+                    bucket = self._by_letter.get(letter)
+                    if bucket:
+                        buckets.append(bucket)
+            self._draw(buckets, k, excluded, chosen, rng)
+
+        self._draw([self.pool], k, excluded, chosen, rng)
+
+        if len(chosen) < k:
+            # 音节池很小或大部分都被排除时，退回到线性筛选
+            rest = [s for s in self.pool if s not in excluded and s not in chosen]
+            rng.shuffle(rest)
+            for syllable in rest[:k - len(chosen)]:
+                chosen[syllable] = None
+
+        return list(chosen)
@@ -0,0 +1,64 @@
+# 构建时的字体子集化 - 只保留词库和界面实际用到的字符，完整的中文字体有几十MB，子集只有几百KB
+#
+# 收集词库中chinese列的汉字、syllables列的音标、单词和音节的字母，以及界面源码中的中文文字；
+# 需要fontTools（pip install fonttools），只在构建时使用，由build_assets.py --font调用
+import io
+import os
+import string
+import tokenize
+
+# 界面文字所在的源文件（按钮、标题、提示等）
+UI_SOURCES = ('EngRem_four2.py',)
+
+# 始终保留可打印的ASCII字符（进度数字、手动输入等）
+BASE_CHARACTERS = set(string.printable) - set('\t\n\r\x0b\x0c')
+
+
+def collect_characters(rows, ui_sources=UI_SOURCES):
+    """词库行（按COLUMNS顺序）和界面源码中用到的所有字符"""
+    characters = set(BASE_CHARACTERS)
+    for row in rows:
+        for value in row:
+            characters.update(value)
+    for path in ui_sources:
+        with open(path, encoding='utf-8') as f:
+            source = f.read()
+        # 只取字符串常量中的非ASCII字符（界面中的中文），注释不会显示；ASCII已经全部包含
+        for token in tokenize.generate_tokens(io.StringIO(source).readline):
+            if token.type == tokenize.STRING:
+                characters.update(char for char in token.string if ord(char) > 127)
+    return characters
+
+
+def subset_font(source, target, characters, font_number=0):
+    """把source字体（ttf/otf/ttc中的第font_number个）裁剪为只包含characters的ttf，返回报告"""
+    from fontTools import subset
+
+    options = subset.Options()
+    options.font_number = font_number
+    options.hinting = False  # 界面按像素缩放绘制，不需要hinting
+    options.desubroutinize = True
+    options.notdef_outline = True
+    options.name_IDs = ['*']
+
+    font = subset.load_font(source, options, dontLoadGlyphNames=True)
+    available = set(font.getBestCmap() or {})
+    missing = sorted(char for char in characters if ord(char) not in available and not char.isspace())
+
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(text=''.join(characters))
+    subsetter.subset(font)
+    directory = os.path.dirname(target)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = target + '.tmp'
+    subset.save_font(font, tmp_path, options)
+    os.replace(tmp_path, target)
+    return {
+        'source': os.path.basename(source),
+        'source_size': os.path.getsize(source),
+        'size': os.path.getsize(target),
+        'characters': len(characters),
+        'glyphs': len(font.getGlyphOrder()),
+        'missing': ''.join(missing)
+    }
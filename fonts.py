@@ -0,0 +1,71 @@
+# 字体解析 - 控件按名称使用simsun、SimHei和times，这里把这些名称注册到实际存在的字体文件
+#
+# 优先使用build_assets.py --font生成的子集字体（随安装包发布，只包含用到的字符，加载快、纹理小），
+# 其次是各平台的系统字体；名称到文件的查找结果会被缓存，每个名称只注册一次
+import functools
+import os
+
+from applog import logger
+
+# build_assets.py生成的子集字体
+BUNDLED_FONT = 'data_four/fonts/engrem.ttf'
+
+# 控件使用的字体名称 -> 按优先级排列的系统字体（在子集字体之后尝试）
+FONT_CANDIDATES = {
+    'simsun': (
+        r'C:\Windows\Fonts\simsun.ttc',  # 宋体
+        r'C:\Windows\Fonts\msyh.ttc',  # 微软雅黑
+        '/system/fonts/NotoSansCJK-Regular.ttc',  # 安卓
+        '/system/fonts/DroidSansFallback.ttf',
+        '/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc',
+        '/usr/share/fonts/truetype/wqy/wqy-microhei.ttc',
+    ),
+    'SimHei': (
+        r'C:\Windows\Fonts\simhei.ttf',  # 黑体
+        r'C:\Windows\Fonts\msyh.ttc',
+        '/system/fonts/NotoSansCJK-Regular.ttc',
+        '/system/fonts/DroidSansFallback.ttf',
+        '/usr/share/fonts/opentype/noto/NotoSansCJK-Bold.ttc',
+        '/usr/share/fonts/truetype/wqy/wqy-microhei.ttc',
+    ),
+    'times': (
+        r'C:\Windows\Fonts\times.ttf',  # Times New Roman - 支持音标
+        r'C:\Windows\Fonts\arial.ttf',
+        '/system/fonts/NotoSerif-Regular.ttf',
+        '/usr/share/fonts/truetype/dejavu/DejaVuSerif.ttf',
+    ),
+}
+
+_registered = {}  # 已注册的名称 -> 字体文件
+
+
+@functools.lru_cache(maxsize=None)
+def find_font(name):
+    """返回名称对应的字体文件路径，找不到时返回None；结果会被缓存"""
+    from kivy.resources import resource_find
+
+    bundled = resource_find(BUNDLED_FONT)
+    if bundled:
+        return bundled
+    for path in FONT_CANDIDATES.get(name, ()):
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def register_fonts(names=tuple(FONT_CANDIDATES)):
+    """注册控件使用的字体名称，返回{名称: 字体文件}；重复调用不会重复注册"""
+    from kivy.core.text import DEFAULT_FONT, LabelBase
+
+    for name in names:
+        if name in _registered:
+            continue
+        path = find_font(name)
+        if path is None:
+            # 没有可用的字体时使用kivy自带的字体，至少英文和数字可以显示
+            logger.warning('EngRem: 找不到字体 %s，使用默认字体 %s', name, DEFAULT_FONT)
+            path = LabelBase._fonts[DEFAULT_FONT][0]
+        LabelBase.register(name=name, fn_regular=path)
+        _registered[name] = path
+        logger.info('EngRem: 已注册字体: %s 路径: %s', name, path)
+    return dict(_registered)
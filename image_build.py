@@ -0,0 +1,135 @@
+# 构建时的图片处理 - 把界面图片按每个密度档位缩放后打包为kivy图集（.atlas + png）
+#
+# 一个图集只有一张纹理，所有图标只需上传一次；低密度的手机使用缩小的图集，占用的显存更少。
+# 需要Pillow（pip install pillow），只在构建时使用，由build_assets.py --atlas调用；
+# 图集格式与kivy.atlas.Atlas.create生成的相同，但不需要在构建环境安装kivy
+import json
+import os
+
+from ui_images import ATLAS_NAME, DENSITY_BUCKETS, SOURCE_DENSITY
+
+# 图片之间的间隔，边缘像素会向外复制到间隔中，避免纹理过滤时采样到相邻图片；图集外沿不留间隔
+PADDING = 2
+# 图集纹理的最大边长，大多数手机GPU都支持
+MAX_ATLAS_SIZE = 2048
+
+
+def _pack(sizes, width):
+    """按高度从大到小逐行摆放，返回每张图片的左上角位置和实际用到的(宽, 高)；放不下时返回None"""
+    order = sorted(range(len(sizes)), key=lambda i: (-sizes[i][1], -sizes[i][0]))
+    positions = [None] * len(sizes)
+    x = y = row_height = used_width = 0
+    for i in order:
+        w, h = sizes[i]
+        if w > width:
+            return None
+        if x and x + w > width:
+            x, y, row_height = 0, y + row_height + PADDING, 0
+        positions[i] = (x, y)
+        used_width = max(used_width, x + w)
+        x += w + PADDING
+        row_height = max(row_height, h)
+    return positions, (used_width, y + row_height)
+
+
+def _layout(sizes):
+    """尝试每一种行宽（前k张图片排成一行的宽度），取纹理面积最小的摆放；
+    纹理不需要取2的幂，kivy可以直接使用任意尺寸的纹理"""
+    widths = sorted(size[0] for size in sizes)
+    order = sorted(sizes, key=lambda size: (-size[1], -size[0]))
+    candidates = {widths[-1]}
+    row = -PADDING
+    for w, _ in order:
+        row += w + PADDING
+        candidates.add(row)
+    best = None
+    for width in sorted(candidates):
+        packed = _pack(sizes, width)
+        if packed is None:
+            continue
+        positions, (used_width, used_height) = packed
+        if used_width > MAX_ATLAS_SIZE or used_height > MAX_ATLAS_SIZE:
+            continue
+        area = used_width * used_height
+        if best is None or area < best[0]:
+            best = (area, positions, (used_width, used_height))
+    if best is None:
+        raise ValueError(f'图片太多，图集超过 {MAX_ATLAS_SIZE}x{MAX_ATLAS_SIZE}')
+    return best[1], best[2]
+
+
+def _paste_with_border(page, image, x, y):
+    """贴上图片，并把四条边的像素向外复制PADDING像素（超出图集的部分被裁掉）"""
+    from PIL import Image
+
+    w, h = image.size
+    page.paste(image, (x, y))
+    page.paste(image.crop((0, 0, w, 1)).resize((w, PADDING), Image.NEAREST), (x, y - PADDING))
+    page.paste(image.crop((0, h - 1, w, h)).resize((w, PADDING), Image.NEAREST), (x, y + h))
+    page.paste(image.crop((0, 0, 1, h)).resize((PADDING, h), Image.NEAREST), (x - PADDING, y))
+    page.paste(image.crop((w - 1, 0, w, h)).resize((PADDING, h), Image.NEAREST), (x + w, y))
+
+
+def build_atlas(images, atlas_path):
+    """把{图片名: PIL图片}打包为一个图集，atlas_path为.atlas文件路径，返回纹理的(宽, 高)"""
+    from PIL import Image
+
+    names = sorted(images)
+    sizes = [images[name].size for name in names]
+    positions, (width, height) = _layout(sizes)
+
+    page = Image.new('RGBA', (width, height), (0, 0, 0, 0))
+    for name, (x, y) in zip(names, positions):
+        _paste_with_border(page, images[name], x, y)
+
+    base = os.path.splitext(atlas_path)[0]
+    page_name = os.path.basename(base) + '-0.png'
+    page.save(os.path.join(os.path.dirname(atlas_path), page_name), optimize=True)
+    # kivy图集的坐标以左下角为原点
+    meta = {page_name: {name: [x, height - y - h, w, h]
+                        for name, (x, y), (w, h) in zip(names, positions, sizes)}}
+    with open(atlas_path, 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False, indent=1)
+    return width, height
+
+
+def source_gpu_bytes(sources):
+    """不使用图集时，每张原图单独作为一个纹理占用的显存（RGBA每像素4字节）"""
+    from PIL import Image
+
+    total = 0
+    for path in sources.values():
+        with Image.open(path) as image:
+            total += image.width * image.height * 4
+    return total
+
+
+def build_density_atlases(sources, out_dir):
+    """sources为{图片名: 原图路径}，为每个密度档位生成一个图集，返回{档位: 报告}"""
+    from PIL import Image
+
+    originals = {}
+    for name, path in sources.items():
+        with Image.open(path) as image:
+            originals[name] = image.convert('RGBA')
+    os.makedirs(out_dir, exist_ok=True)
+
+    result = {}
+    for bucket, density in DENSITY_BUCKETS:
+        scale = min(1.0, density / SOURCE_DENSITY)
+        images = {}
+        for name, image in originals.items():
+            size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+            images[name] = image if size == image.size else image.resize(size, Image.LANCZOS)
+        atlas_path = os.path.join(out_dir, f'{ATLAS_NAME}-{bucket}.atlas')
+        width, height = build_atlas(images, atlas_path)
+        page_path = os.path.splitext(atlas_path)[0] + '-0.png'
+        result[bucket] = {
+            'atlas': atlas_path,
+            'page': page_path,
+            'texture': [width, height],
+            'size': os.path.getsize(page_path),
+            # 纹理上传到GPU后占用的显存（RGBA每像素4字节）
+            'gpu_bytes': width * height * 4
+        }
+    return result
@@ -0,0 +1,133 @@
+# 性能测量 - 记录切换单词、生成选项、播放发音、检查答案、加载分类的耗时以及每帧间隔，
+# 在真机上统计p50/p95/p99，用于发现每个单词流程中的性能退化
+#
+# 默认关闭，设置环境变量 ENGREM_INSTRUMENT=1 开启：屏幕右上角显示统计浮层，退出时把结果写入
+# 应用数据目录的 instrument.json。关闭时timed装饰器直接返回原函数，没有任何额外开销
+import functools
+import json
+import math
+import os
+import time
+from array import array
+
+ENABLED = os.environ.get('ENGREM_INSTRUMENT', '').lower() in ('1', 'true', 'yes', 'on')
+
+# 每项指标保留最近的样本数
+RING_SIZE = 512
+# 浮层刷新间隔（秒）
+OVERLAY_INTERVAL = 1.0
+
+DUMP_NAME = 'instrument.json'
+
+
+class RingBuffer:
+    """固定大小的样本缓冲区，写满后覆盖最早的样本"""
+
+    def __init__(self, size=RING_SIZE):
+        self._samples = array('d', bytes(8 * size))
+        self._size = size
+        self._next = 0
+        self.count = 0  # 累计样本数（包括已被覆盖的）
+
+    def add(self, value):
+        self._samples[self._next] = value
+        self._next = (self._next + 1) % self._size
+        self.count += 1
+
+    def values(self):
+        return self._samples[:min(self.count, self._size)]
+
+    def percentiles(self, *ps):
+        values = sorted(self.values())
+        if not values:
+            return [0.0 for _ in ps]
+        # 最近秩法
+        return [values[min(len(values) - 1, max(0, math.ceil(p / 100 * len(values)) - 1))] for p in ps]
+
+
+_metrics = {}
+# dump时一并写入的其他模块的统计：名称 -> 返回可以写成JSON的数据的函数
+_stats_providers = {}
+
+
+def record(name, ms):
+    buffer = _metrics.get(name)
+    if buffer is None:
+        buffer = _metrics[name] = RingBuffer()
+    buffer.add(ms)
+
+
+def timed(name):
+    """测量函数耗时（毫秒）的装饰器；未开启时返回原函数"""
+    def decorator(func):
+        if not ENABLED:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(name, (time.perf_counter() - started) * 1000)
+        return wrapper
+    return decorator
+
+
+def mark_interaction(name):
+    """从点击到下一帧（界面更新）的耗时，在事件处理开始时调用"""
+    if not ENABLED:
+        return
+    from kivy.clock import Clock
+
+    started = time.perf_counter()
+    Clock.schedule_once(lambda dt: record(name, (time.perf_counter() - started) * 1000), 0)
+
+
+def register_stats(name, provider):
+    """登记其他模块的统计（例如缓存命中率），退出时与耗时统计一起写入instrument.json"""
+    _stats_providers[name] = provider
+
+
+def summary():
+    result = {}
+    for name, buffer in sorted(_metrics.items()):
+        p50, p95, p99 = buffer.percentiles(50, 95, 99)
+        result[name] = {'count': buffer.count, 'p50': round(p50, 3), 'p95': round(p95, 3), 'p99': round(p99, 3),
+                        'max': round(max(buffer.values()), 3)}
+    return result
+
+
+def dump(path):
+    """把统计结果和原始样本写入JSON文件"""
+    data = {'time': time.time(), 'summary': summary(),
+            'stats': {name: provider() for name, provider in sorted(_stats_providers.items())},
+            'samples': {name: [round(value, 3) for value in buffer.values()] for name, buffer in _metrics.items()}}
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=1)
+
+
+def install(window):
+    """开启帧间隔统计，并在窗口上显示统计浮层；返回浮层控件，未开启时返回None"""
+    if not ENABLED:
+        return None
+    from kivy.clock import Clock
+    from kivy.uix.label import Label
+
+    # 每帧调用一次，dt就是两帧之间的间隔
+    Clock.schedule_interval(lambda dt: record('frame', dt * 1000), 0)
+
+    overlay = Label(size_hint=(None, None), halign='left', valign='top', font_size='12sp',
+                    color=(0, 0, 0, 0.8), markup=False)
+
+    def refresh(dt):
+        lines = [f'{name}: n={stats["count"]} p50={stats["p50"]:.1f} p95={stats["p95"]:.1f} p99={stats["p99"]:.1f}'
+                 for name, stats in summary().items()]
+        overlay.text = '\n'.join(lines)
+        overlay.texture_update()
+        overlay.size = overlay.texture_size
+        overlay.pos = (window.width - overlay.width - 10, window.height - overlay.height - 10)
+
+    Clock.schedule_interval(refresh, OVERLAY_INTERVAL)
+    window.add_widget(overlay)
+    return overlay
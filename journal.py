@@ -0,0 +1,175 @@
+# 进度日志 - 每次作答追加一条记录，应用被系统结束也不会丢失进度
+#
+# progress.log 每行一条JSON记录（带递增序号），由后台线程写入，积累若干条或超过一定时间才fsync一次，
+# 界面线程只需把记录放入队列；记录足够多时后台线程把状态压缩为快照（schedule.json，即Scheduler的保存格式），
+# 再清空日志。启动时读取快照并重放序号大于快照的记录；快照替换后、日志清空前被结束时，
+# 重放会跳过已经包含在快照中的记录
+import json
+import os
+import queue
+import threading
+import time
+
+from applog import logger, report_error
+from scheduler import Card, Scheduler
+
+JOURNAL_NAME = 'progress.log'
+SNAPSHOT_NAME = 'schedule.json'
+
+# 积累这么多条记录，或距离上次fsync超过这么多秒时fsync一次
+SYNC_BATCH = 16
+SYNC_INTERVAL = 2.0
+# 日志中的记录超过该数量时压缩为快照
+COMPACT_RECORDS = 1000
+
+_STOP = object()
+
+
+class ProgressJournal:
+    def __init__(self, directory, sync_batch=SYNC_BATCH, sync_interval=SYNC_INTERVAL,
+                 compact_records=COMPACT_RECORDS):
+        self.journal_path = os.path.join(directory, JOURNAL_NAME)
+        self.snapshot_path = os.path.join(directory, SNAPSHOT_NAME)
+        self.sync_batch = sync_batch
+        self.sync_interval = sync_interval
+        self.compact_records = compact_records
+        self.session = None  # 上次未完成的练习进度，启动时恢复
+        self.replayed = 0  # 启动时重放的记录数
+        self._queue = queue.Queue()
+        self._thread = None
+        self._seq = 0  # 最后一条记录的序号，只在界面线程中修改
+        self._replica = None  # 后台线程维护的状态副本，压缩时直接保存为快照
+        self._since_snapshot = 0
+
+    def restore(self):
+        """读取快照并重放日志，返回恢复后的Scheduler；在start()之前调用"""
+        replica = Scheduler.load(self.snapshot_path)
+        seq = replica.meta.get('seq', 0)
+        valid_length = 0
+        try:
+            with open(self.journal_path, 'rb') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # 最后一条记录可能只写了一半
+                        break
+                    valid_length += len(line)
+                    if record['n'] <= seq:
+                        continue
+                    self._apply(replica, record)
+                    seq = record['n']
+                    self.replayed += 1
+            # 截掉不完整的记录，之后追加的记录才能正确分行
+            if valid_length < os.path.getsize(self.journal_path):
+                os.truncate(self.journal_path, valid_length)
+        except FileNotFoundError:
+            pass
+
+        self._replica = replica
+        self._seq = seq
+        self._since_snapshot = self.replayed
+        self.session = replica.meta.get('session')
+
+        # 界面线程使用独立的副本，后台线程的副本只由后台线程修改
+        scheduler = Scheduler(journal=self)
+        scheduler.cards = {word: Card(card.ease, card.interval, card.repetitions, card.due, card.lapses)
+                           for word, card in replica.cards.items()}
+        return scheduler
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='progress-journal', daemon=True)
+        self._thread.start()
+
+    def record_review(self, word, quality, now):
+        self._put({'k': 'r', 'w': word, 'q': quality, 't': now})
+
+    def record_session(self, progress):
+        """记录当前练习的进度（分类、已出的单词数、答对数等），练习结束时传入None"""
+        self.session = progress
+        self._put({'k': 's', 's': progress})
+
+    def _put(self, record):
+        self._seq += 1
+        record['n'] = self._seq
+        self._queue.put(record)
+
+    def flush(self, timeout=1.0):
+        """等待已提交的记录全部写入磁盘（切到后台时调用）"""
+        if self._thread is None:
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self, timeout=2.0):
+        """写完剩余记录、压缩为快照并结束后台线程"""
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self._thread = None
+
+    @staticmethod
+    def _apply(scheduler, record):
+        if record['k'] == 'r':
+            scheduler.review(record['w'], record['q'], record['t'])
+        elif record['k'] == 's':
+            scheduler.meta['session'] = record['s']
+            scheduler.dirty = True
+
+    def _run(self):
+        try:
+            self._write_loop()
+        except Exception as e:
+            report_error('写入进度日志', e)
+
+    def _write_loop(self):
+        f = open(self.journal_path, 'ab')
+        unsynced = 0
+        last_sync = time.monotonic()
+        try:
+            while True:
+                try:
+                    item = self._queue.get(timeout=self.sync_interval if unsynced else None)
+                except queue.Empty:
+                    item = None
+
+                if isinstance(item, dict):
+                    f.write(json.dumps(item, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+                    f.write(b'\n')
+                    self._apply(self._replica, item)
+                    self._replica.meta['seq'] = item['n']
+                    unsynced += 1
+                    self._since_snapshot += 1
+                    if unsynced < self.sync_batch and time.monotonic() - last_sync < self.sync_interval:
+                        continue
+
+                # 批量fsync：积累够了、超时、或者有人在等待写入完成
+                if unsynced:
+                    f.flush()
+                    os.fsync(f.fileno())
+                    unsynced = 0
+                    last_sync = time.monotonic()
+
+                if self._since_snapshot >= self.compact_records or (item is _STOP and self._since_snapshot):
+                    f = self._compact(f)
+                if isinstance(item, threading.Event):
+                    item.set()
+                elif item is _STOP:
+                    return
+        finally:
+            f.close()
+
+    def _compact(self, f):
+        started = time.perf_counter()
+        self._replica.path = self.snapshot_path
+        self._replica.dirty = True
+        self._replica.save()
+        # 快照已经包含日志中的所有记录，清空日志
+        f.close()
+        f = open(self.journal_path, 'wb')
+        logger.debug('EngRem: 进度日志已压缩: %d 条记录, %.1f ms',
+                     self._since_snapshot, (time.perf_counter() - started) * 1000)
+        self._since_snapshot = 0
+        return f
@@ -0,0 +1,108 @@
+# 彩色音节的富文本和纹理缓存 - 常见音节（"er"、"an"……）在不同单词和分类中反复出现，
+# 同样的文字、字体和字号只生成一次markup字符串、只光栅化一次纹理
+from collections import OrderedDict
+
+import instrument
+
+VOWELS = frozenset('aeiouAEIOU')
+
+# 与原来ColoredButton中的颜色一致
+VOWEL_HEX = 'ff4500'  # 橙红色 - 元音
+CONSONANT_HEX = '6495ed'  # 蓝色 - 辅音
+
+# markup字符串很小，按条数限制；纹理按像素字节数限制
+MARKUP_CACHE_SIZE = 2048
+TEXTURE_CACHE_BYTES = 4 * 1024 * 1024
+
+
+# kivy markup中的特殊字符
+MARKUP_ESCAPES = {'&': '&amp;', '[': '&bl;', ']': '&br;'}
+
+
+def rgba_to_hex(rgba):
+    return ''.join(f'{int(round(channel * 255)):02x}' for channel in rgba[:3])
+
+
+class LRUCache:
+    """按条数或按权重（例如纹理字节数）限制大小的LRU缓存"""
+
+    def __init__(self, max_weight, weigh=None):
+        self.max_weight = max_weight
+        self.weight = 0
+        self.hits = 0
+        self.misses = 0
+        self._weigh = weigh or (lambda value: 1)
+        self._entries = OrderedDict()  # 键 -> (值, 权重)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, create):
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+        self.misses += 1
+        value = create()
+        weight = self._weigh(value)
+        self._entries[key] = (value, weight)
+        self.weight += weight
+        # 至少保留刚放入的一项
+        while self.weight > self.max_weight and len(self._entries) > 1:
+            _, (_, evicted_weight) = self._entries.popitem(last=False)
+            self.weight -= evicted_weight
+        return value
+
+    def clear(self):
+        self._entries.clear()
+        self.weight = 0
+
+
+_markup_cache = LRUCache(MARKUP_CACHE_SIZE)
+_texture_cache = LRUCache(TEXTURE_CACHE_BYTES,
+                          weigh=lambda texture: texture.width * texture.height * 4 if texture else 0)
+
+
+def _build_markup(text, vowel_hex, consonant_hex, bold):
+    parts = []
+    for char in text:
+        # 检查是否为元音
+        color = vowel_hex if char in VOWELS else consonant_hex
+        parts.append(f'[color={color}]{MARKUP_ESCAPES.get(char, char)}[/color]')
+    markup = ''.join(parts)
+    return f'[b]{markup}[/b]' if bold else markup
+
+
+def colored_markup(text, vowel_hex=VOWEL_HEX, consonant_hex=CONSONANT_HEX, bold=True):
+    """元音和辅音分色显示的markup字符串"""
+    key = (text, vowel_hex, consonant_hex, bold)
+    return _markup_cache.get(key, lambda: _build_markup(text, vowel_hex, consonant_hex, bold))
+
+
+def _render(markup, font_name, font_size):
+    from kivy.core.text.markup import MarkupLabel
+
+    label = MarkupLabel(text=markup, font_name=font_name, font_size=font_size)
+    label.refresh()
+    return label.texture
+
+
+def colored_texture(text, font_name, font_size, vowel_hex=VOWEL_HEX, consonant_hex=CONSONANT_HEX, bold=True):
+    """分色音节渲染后的纹理，相同文字、字体和字号共用同一个纹理"""
+    markup = colored_markup(text, vowel_hex, consonant_hex, bold)
+    key = (markup, font_name, font_size)
+    return _texture_cache.get(key, lambda: _render(markup, font_name, font_size))
+
+
+def cache_stats():
+    """两级缓存的大小和命中次数，写入instrument.json"""
+    return {
+        'markup': {'size': len(_markup_cache), 'hits': _markup_cache.hits, 'misses': _markup_cache.misses},
+        'texture': {'size': len(_texture_cache), 'bytes': _texture_cache.weight,
+                    'hits': _texture_cache.hits, 'misses': _texture_cache.misses}
+    }
+
+
+instrument.register_stats('markup_cache', cache_stats)
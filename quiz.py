@@ -0,0 +1,233 @@
+# 答题引擎 - 与kivy界面无关的纯Python逻辑：选词、生成选项、提示、检查答案和进入下一题
+#
+# WordLearningScreen只负责把QuizSession的状态显示出来，因此这部分逻辑可以在没有窗口的情况下
+# 测试和做性能分析（见 benchmarks/bench_quiz.py）
+# 传入scheduler时只出到期的单词（见scheduler.py），每个单词答对后按提示和选错的情况记录回忆质量
+import random
+import time
+
+from distractors import DistractorPool
+from instrument import timed
+from scheduler import PASS_QUALITY, RELEARN_DELAY, ReviewQueue
+from spelling import normalize
+
+# 每个单词显示的选项数量（正确音节 + 干扰音节）
+OPTION_COUNT = 10
+
+
+class QuizSession:
+    def __init__(self, words, option_count=OPTION_COUNT, confusable=False, rng=random, shuffle=True,
+                 scheduler=None, clock=time.time, category=None):
+        self.words = list(words)
+        self.category = category
+        self.option_count = option_count
+        self.confusable = confusable
+        self.rng = rng
+        # 每个分类建立一次干扰选项音节池
+        self.distractors = DistractorPool.from_words(self.words)
+        if shuffle:
+            # 对单词列表进行随机打乱
+            rng.shuffle(self.words)
+        self.scheduler = scheduler
+        self.clock = clock
+        if scheduler is None:
+            # 没有调度器时按（打乱后的）顺序依次出每个单词
+            self.queue = ReviewQueue((0, word) for word in self.words)
+        else:
+            self.queue = scheduler.session_queue(self.words, clock())
+        self.total = len(self.queue)  # 本次练习的单词数（不含重新学习的次数）
+        self.current = self.queue.pop() if self.queue else None
+        self.relearning = set()  # 本次练习中没有记住、需要再出一次的单词
+        self.index = 0  # 已经进行的题数（含重新学习的次数）
+        self.answered_count = 0  # 已经答完的不同单词数
+        self._answered_words = set()
+        self.correct_count = 0
+        self.hint_index = 0
+        self.revealed = False  # 是否已经提示了整个单词
+        self.wrong_taps = 0
+        self.answer = ''
+        self.answered = False  # 当前单词是否已经答对（防止重复计分）
+        # 增量匹配状态：答案与单词开头一致的字符数，以及答案是否仍是单词的前缀
+        self.matched = 0
+        self.on_path = True
+        # 答对后提前准备好的下一题：(单词, 选项)，进入下一题时直接使用
+        self.prepared = None
+        self._prepared_options = None
+
+    @property
+    def finished(self):
+        return self.current is None
+
+    @property
+    def all_answered(self):
+        """当前单词的结果已经记录且没有下一个单词（答对最后一个单词后的延迟期间），之后不需要恢复进度"""
+        return self.finished or (self.prepared is not None and self.prepared[0] is None)
+
+    @property
+    def current_word(self):
+        return self.current
+
+    @property
+    def is_prefix(self):
+        """当前答案是否仍是正确单词的开头；为False时界面可以立即提示选错了"""
+        return self.on_path
+
+    def upcoming(self, count):
+        """当前单词及之后的count个单词，用于预加载音频"""
+        if self.current is None:
+            return []
+        return [self.current] + self.queue.upcoming(count)
+
+    def progress(self):
+        """可以保存的练习进度，用于应用被结束后恢复"""
+        return {'category': self.category, 'index': self.index, 'answered': self.answered_count,
+                'correct': self.correct_count, 'total': self.total}
+
+    def resume(self, progress):
+        """接着保存的进度继续：已经答过的单词不在新的队列中，这里只恢复计数；
+        总数加上答完的不同单词数，index包含重新学习的次数，不能用来计算总数"""
+        # 旧版本的进度没有answered，每个单词第一次答完时都会计入correct
+        answered = progress.get('answered', progress['correct'])
+        self.total += answered
+        self.answered_count = answered
+        self.index = progress['index']
+        self.correct_count = progress['correct']
+
+    def syllables(self):
+        # 音节在加载词库时已经拆分好
+        return self.current_word.parts
+
+    def options(self):
+        """当前单词的选项：正确音节加上不重复的干扰音节，顺序随机"""
+        if self._prepared_options is not None:
+            # 进入这一题之前已经生成好了
+            all_options, self._prepared_options = self._prepared_options, None
+            return all_options
+        return self._options_for(self.current_word)
+
+    def _options_for(self, word):
+        all_options = list(word.parts)
+        all_options.extend(self.distractors.sample(self.option_count - len(all_options),
+                                                   exclude=word.parts,
+                                                   rng=self.rng,
+                                                   confusable=self.confusable))
+        self.rng.shuffle(all_options)
+        return all_options
+
+    def _match(self, text):
+        # 只比较新追加的文字，不重新比较整个答案
+        if self.on_path and self.current_word.word.startswith(text, self.matched):
+            self.matched += len(text)
+        elif self.on_path:
+            self.on_path = False
+            self.wrong_taps += 1
+
+    def _rematch(self):
+        # 答案被整体替换（手动编辑输入框）时重新计算匹配状态；按原样比较，之后追加的音节接在这段文字后面
+        self.on_path = self.current_word.word.startswith(self.answer)
+        self.matched = len(self.answer) if self.on_path else 0
+
+    def set_answer(self, text):
+        """同步输入框中的文字；与当前答案相同（没有手动编辑）时不需要重新匹配"""
+        if text != self.answer:
+            self.answer = text
+            self._rematch()
+
+    def add_syllable(self, syllable):
+        """追加选中的音节，返回是否答对；已经答对后不再追加"""
+        if self.answered:
+            return False
+        self.answer += syllable
+        self._match(syllable)
+        return self.check_answer()
+
+    def submit(self, text):
+        """手动输入并提交（回车）整个答案，返回是否答对；答错计为一次选错。
+        与拼写纠错相同，忽略首尾的空白和大小写，答对时答案改为单词本来的拼写"""
+        if normalize(text) == normalize(self.current_word.word):
+            text = self.current_word.word
+        self.set_answer(text.strip())
+        if self.check_answer():
+            return True
+        if not self.answered:
+            self.wrong_taps += 1
+        return False
+
+    def clear(self):
+        self.answer = ''
+        self.matched = 0
+        self.on_path = True
+
+    def hint(self):
+        """依次给出下一个音节，所有音节都提示过后给出整个单词；返回是否答对；已经答对后不再提示"""
+        if self.answered:
+            return False
+        word = self.current_word.word
+        syllables = self.syllables()
+        if syllables and self.hint_index < len(syllables):
+            # 显示当前index对应的音节，并增加提示索引
+            self.answer += syllables[self.hint_index]
+            self._match(syllables[self.hint_index])
+            self.hint_index += 1
+        elif word:
+            # 所有音节都已提示但单词还不正确，或者没有音节：显示整个单词
+            self.answer = word
+            self.matched = len(word)
+            self.on_path = True
+            self.revealed = True
+        return self.check_answer()
+
+    @timed('check_answer')
+    def check_answer(self):
+        """比较当前答案和正确单词；第一次答对时计分并返回True"""
+        if self.answered:
+            return False
+        # 匹配状态是增量维护的，这里不需要比较字符串
+        if self.on_path and self.matched == len(self.current_word.word):
+            self.answered = True
+            if self.current_word not in self.relearning:
+                self.correct_count += 1
+            return True
+        return False
+
+    def recall_quality(self):
+        """SM-2的回忆质量(0-5)：没有提示和选错为5，每选错一次减1，用了提示视为没有记住"""
+        if self.revealed:
+            return 1
+        if self.hint_index:
+            return 2
+        return max(PASS_QUALITY, 5 - self.wrong_taps)
+
+    def prepare_next(self):
+        """答对后、进入下一题之前调用：记录作答结果，取出下一个单词并生成选项，返回(单词, 选项)；
+        没有下一个单词时返回(None, None)。界面在答对后的延迟期间调用，提前准备下一题；
+        复习记录和答完的单词数在这里同时更新，调用后应立即保存progress()"""
+        if self.prepared is None:
+            if self.current is not None and self.current not in self._answered_words:
+                self._answered_words.add(self.current)
+                self.answered_count += 1
+            if self.scheduler is not None and self.current is not None:
+                now = self.clock()
+                quality = self.recall_quality()
+                self.scheduler.review(self.current.word, quality, now)
+                if quality < PASS_QUALITY:
+                    # 没有记住的单词稍后再出一次
+                    self.relearning.add(self.current)
+                    self.queue.push(self.current, now + RELEARN_DELAY)
+            word = self.queue.pop() if self.queue else None
+            self.prepared = (word, self._options_for(word) if word is not None else None)
+        return self.prepared
+
+    def advance(self):
+        """记录当前单词的作答结果并进入下一题，返回是否还有单词"""
+        self.current, self._prepared_options = self.prepare_next()
+        self.prepared = None
+        self.index += 1
+        self.hint_index = 0
+        self.revealed = False
+        self.wrong_taps = 0
+        self.answer = ''
+        self.answered = False
+        self.matched = 0
+        self.on_path = True
+        return not self.finished
@@ -0,0 +1,156 @@
+# 间隔重复调度 - SM-2算法，按单词保存记忆状态，每次练习只出到期的单词
+#
+# 每个单词的状态（难度系数、间隔、连续答对次数、到期时间）保存在应用数据目录的JSON文件中；
+# 一次练习的单词放在按到期时间排列的最小堆里，取出下一个和放回都是O(log n)，
+# 几万个单词的分类也只需在开始时O(n)建堆
+import heapq
+import json
+import os
+import time
+
+from applog import logger
+
+SCHEDULE_VERSION = 1
+
+DAY = 24 * 60 * 60
+
+# SM-2参数
+INITIAL_EASE = 2.5
+MIN_EASE = 1.3
+# 回忆质量低于该值视为没有记住，间隔重新开始
+PASS_QUALITY = 3
+
+# 没有记住的单词在本次练习中稍后再出一次（秒）
+RELEARN_DELAY = 60
+
+# 分类中没有到期的单词时，提前练习最早到期的若干个
+PRACTICE_AHEAD_COUNT = 10
+
+
+class Card:
+    """一个单词的记忆状态"""
+    __slots__ = ('ease', 'interval', 'repetitions', 'due', 'lapses')
+
+    def __init__(self, ease=INITIAL_EASE, interval=0.0, repetitions=0, due=0.0, lapses=0):
+        self.ease = ease
+        self.interval = interval  # 天
+        self.repetitions = repetitions  # 连续答对次数
+        self.due = due  # 到期时间（时间戳）
+        self.lapses = lapses  # 忘记的次数
+
+    def to_list(self):
+        return [round(self.ease, 3), self.interval, self.repetitions, round(self.due), self.lapses]
+
+    def review(self, quality, now):
+        """按SM-2更新状态，quality为0-5的回忆质量"""
+        if quality < PASS_QUALITY:
+            self.repetitions = 0
+            self.interval = 1
+            self.lapses += 1
+        else:
+            self.repetitions += 1
+            if self.repetitions == 1:
+                self.interval = 1
+            elif self.repetitions == 2:
+                self.interval = 6
+            else:
+                self.interval = round(self.interval * self.ease, 1)
+        self.ease = max(MIN_EASE, self.ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+        self.due = now + self.interval * DAY
+
+
+class ReviewQueue:
+    """一次练习的单词队列，按(到期时间, 加入顺序)排列的最小堆"""
+
+    def __init__(self, entries=()):
+        self._heap = [(due, seq, word) for seq, (due, word) in enumerate(entries)]
+        heapq.heapify(self._heap)
+        self._seq = len(self._heap)
+
+    def __len__(self):
+        return len(self._heap)
+
+    def pop(self):
+        return heapq.heappop(self._heap)[2]
+
+    def push(self, word, due):
+        heapq.heappush(self._heap, (due, self._seq, word))
+        self._seq += 1
+
+    def upcoming(self, count):
+        """接下来的count个单词（不取出）；最小的k项一定在堆的前2^k-1个位置中"""
+        if count <= 0:
+            return []
+        candidates = self._heap[:(1 << count) - 1]
+        return [entry[2] for entry in heapq.nsmallest(count, candidates)]
+
+
+class Scheduler:
+    def __init__(self, path=None, journal=None):
+        self.path = path
+        self.journal = journal  # 进度日志（ProgressJournal），每次作答追加一条记录
+        self.cards = {}  # 单词 -> Card，同一个单词在不同分类中共用状态
+        self.meta = {}  # 与状态一起保存的其他信息（例如日志序号）
+        self.dirty = False
+
+    @classmethod
+    def load(cls, path):
+        """读取保存的状态，文件不存在或已损坏时从空状态开始"""
+        scheduler = cls(path)
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return scheduler
+        except (OSError, ValueError) as e:
+            logger.warning('EngRem: 无法读取复习记录 %s: %s', path, e)
+            return scheduler
+        if data.get('version') == SCHEDULE_VERSION:
+            scheduler.cards = {word: Card(*values) for word, values in data.get('cards', {}).items()}
+            scheduler.meta = data.get('meta', {})
+        return scheduler
+
+    def save(self):
+        if not self.path or not self.dirty:
+            return
+        data = {'version': SCHEDULE_VERSION,
+                'cards': {word: card.to_list() for word, card in self.cards.items()},
+                'meta': self.meta}
+        tmp_path = self.path + '.tmp'
+        # 先整体序列化再写入，比json.dump逐块写文件快得多
+        encoded = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(encoded)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+    def review(self, key, quality, now=None):
+        """记录一次作答，返回更新后的状态"""
+        now = time.time() if now is None else now
+        card = self.cards.get(key)
+        if card is None:
+            card = self.cards[key] = Card()
+        card.review(quality, now)
+        self.dirty = True
+        if self.journal is not None:
+            self.journal.record_review(key, quality, now)
+        return card
+
+    def session_queue(self, words, now=None):
+        """本次练习的队列：已到期的单词按到期时间排在前面，新单词随后（保持传入的顺序）"""
+        now = time.time() if now is None else now
+        due = []
+        later = []
+        for word in words:
+            card = self.cards.get(word.word)
+            if card is None:
+                due.append((now, word))
+            elif card.due <= now:
+                due.append((card.due, word))
+            else:
+                later.append((card.due, word))
+        if not due:
+            due = heapq.nsmallest(PRACTICE_AHEAD_COUNT, later, key=lambda entry: entry[0])
+        return ReviewQueue(due)
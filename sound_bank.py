@@ -0,0 +1,112 @@
+# 打包的音频库 - 所有音频的PCM数据放在一个文件中，启动时内存映射，按偏移直接取出
+#
+# 文件格式：
+#   第一行是JSON头部（版本、内容哈希、采样率、采样宽度、声道数、每段音频的偏移和长度），以换行结束
+#   之后是所有音频的PCM数据首尾相接，偏移相对于头部之后
+# kivy的所有音频后端（SoundLoader）都只能从文件名加载，不能直接播放内存中的数据，因此音频库中的音频
+# 要先导出为wav：应用启动后在后台线程中一次导出全部（每个音频只导出一次，之后的运行直接使用已导出的文件），
+# 播放时与逐个文件相同，只需SoundLoader.load。音频库的作用是安装包中只有一个音频文件，而不是播放更快
+# （两种方式的实际耗时见benchmarks/bench_sound_bank.py）
+import hashlib
+import json
+import mmap
+import os
+import threading
+import wave
+
+SOUND_BANK_VERSION = 1
+
+
+def write_sound_bank(clips, bank_path):
+    """把一组wav文件打包，clips为{键: wav路径}，所有wav必须是相同格式；返回头部信息"""
+    header = {'version': SOUND_BANK_VERSION, 'id': '', 'rate': 0, 'width': 0, 'channels': 0, 'clips': {}}
+    body = []
+    offset = 0
+    digest = hashlib.sha1()
+    for key in sorted(clips):
+        with wave.open(clips[key], 'rb') as f:
+            params = (f.getframerate(), f.getsampwidth(), f.getnchannels())
+            data = f.readframes(f.getnframes())
+        if not header['rate']:
+            header['rate'], header['width'], header['channels'] = params
+        elif params != (header['rate'], header['width'], header['channels']):
+            raise wave.Error(f'音频格式与其他文件不一致: {clips[key]}')
+        header['clips'][key] = [offset, len(data)]
+        digest.update(key.encode('utf-8'))
+        digest.update(data)
+        body.append(data)
+        offset += len(data)
+    header['id'] = digest.hexdigest()[:16]
+
+    tmp_path = bank_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(json.dumps(header, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+        f.write(b'\n')
+        for data in body:
+            f.write(data)
+    os.replace(tmp_path, bank_path)
+    return header
+
+
+class SoundBank:
+    """内存映射的音频库；export_dir是导出wav的可写目录（例如应用数据目录）"""
+
+    def __init__(self, path, export_dir=None):
+        self.path = path
+        self.export_dir = export_dir
+        with open(path, 'rb') as f:
+            line = f.readline()
+            self.header = json.loads(line.decode('utf-8'))
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.header.get('version') != SOUND_BANK_VERSION:
+            self.close()
+            raise ValueError(f'不支持的音频库版本: {self.header.get("version")}')
+        self._data_start = len(line)
+        self._clips = self.header['clips']
+
+    def __contains__(self, key):
+        return key in self._clips
+
+    def __len__(self):
+        return len(self._clips)
+
+    def keys(self):
+        return self._clips.keys()
+
+    def clip(self, key):
+        """返回一段音频的PCM数据（内存映射上的memoryview，不复制）"""
+        offset, length = self._clips[key]
+        start = self._data_start + offset
+        return memoryview(self._map)[start:start + length]
+
+    def _export_path(self, key):
+        # 按内容哈希分目录，音频库更新后不会用到旧的导出文件
+        return os.path.join(self.export_dir, self.header['id'], *key.split('/'))
+
+    def export(self, key):
+        """把一段音频写成wav文件并返回路径，已经导出过时直接返回"""
+        path = self._export_path(key)
+        if os.path.exists(path):
+            return path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # 后台线程（预读）和主线程可能同时导出同一个文件，各自写临时文件再替换
+        tmp_path = f'{path}.{threading.get_ident()}.tmp'
+        with wave.open(tmp_path, 'wb') as f:
+            f.setnchannels(self.header['channels'])
+            f.setsampwidth(self.header['width'])
+            f.setframerate(self.header['rate'])
+            f.writeframes(self.clip(key))
+        os.replace(tmp_path, path)
+        return path
+
+    def export_all(self):
+        """导出所有还没有导出的音频（在后台线程中调用），返回新导出的数量"""
+        exported = 0
+        for key in self._clips:
+            if not os.path.exists(self._export_path(key)):
+                self.export(key)
+                exported += 1
+        return exported
+
+    def close(self):
+        self._map.close()
@@ -0,0 +1,100 @@
+# 已解码音频的LRU缓存 - 同一个wav不再在每次播放时重新SoundLoader.load
+#
+# 以解析后的文件路径为键，按字节数限制总大小（wav是未压缩PCM，文件大小近似于解码后的内存占用），
+# 超出时淘汰最久未使用的音频
+import os
+from collections import OrderedDict
+
+# 默认缓存上限：约8MB，足够放下当前单词及后面若干个单词的音频
+DEFAULT_MAX_BYTES = 8 * 1024 * 1024
+
+
+def prefetch_file(path, chunk_size=65536):
+    """读取一遍文件，使其进入系统文件缓存；可在后台线程调用（SoundLoader本身只能在主线程使用）"""
+    if not path:
+        return 0
+    size = 0
+    try:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(chunk_size), b''):
+                size += len(chunk)
+    except OSError:
+        return 0
+    return size
+
+
+class SoundCache:
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, loader=None):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._loader = loader
+        self._entries = OrderedDict()  # 路径 -> (Sound, 字节数)
+        self._pending = []  # 等待后台逐帧预加载的路径
+        self._preload_event = None
+
+    def _load(self, path):
+        if self._loader is None:
+            from kivy.core.audio import SoundLoader
+            self._loader = SoundLoader.load
+        return self._loader(path)
+
+    def __contains__(self, path):
+        return path in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, path):
+        """返回已加载的Sound对象，不在缓存中时加载并放入缓存；加载失败返回None"""
+        entry = self._entries.get(path)
+        if entry is not None:
+            self._entries.move_to_end(path)
+            self.hits += 1
+            return entry[0]
+
+        self.misses += 1
+        sound = self._load(path)
+        if sound is None:
+            return None
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            size = 0
+        self._entries[path] = (sound, size)
+        self.total_bytes += size
+        self._evict()
+        return sound
+
+    def _evict(self):
+        # 至少保留最近使用的一个，避免刚加载的音频被立即淘汰
+        while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+            _, (sound, size) = self._entries.popitem(last=False)
+            self.total_bytes -= size
+            sound.unload()
+
+    def preload(self, paths):
+        """逐帧预加载一组音频，每帧只解码一个文件，不阻塞界面"""
+        self._pending = [path for path in paths if path and path not in self._entries]
+        if self._pending and self._preload_event is None:
+            from kivy.clock import Clock
+            self._preload_event = Clock.schedule_once(self._preload_next, 0)
+
+    def _preload_next(self, dt):
+        self._preload_event = None
+        while self._pending:
+            path = self._pending.pop(0)
+            if path not in self._entries:
+                self.get(path)
+                break
+        if self._pending:
+            from kivy.clock import Clock
+            self._preload_event = Clock.schedule_once(self._preload_next, 0)
+
+    def clear(self):
+        self._pending = []
+        for sound, _ in self._entries.values():
+            sound.unload()
+        self._entries.clear()
+        self.total_bytes = 0
@@ -0,0 +1,114 @@
+# 音频路径索引 - 启动时扫描一次音频目录，播放时只需一次字典查找
+#
+# 词库中的sound字段形如 data\sound2\doctor（Windows分隔符、可能缺少扩展名、目录前缀与实际不一致），
+# 实际文件位于 data_four/sound2，且存在 Mr.wav、Christmas.wav 这样大小写不一的文件名，
+# 因此按（所在目录名, 文件名）忽略大小写匹配，找不到时再只按文件名匹配
+import json
+import os
+
+# 按优先级排列的音频目录（相对于应用目录）
+SOUND_DIRS = ('data_four/sound2', 'data_four/sound', 'data/sound2', 'data/sound')
+
+SOUND_EXTENSIONS = ('.wav',)
+
+
+def sound_key(value):
+    """把sound字段规范化为(目录名, 文件名)，都转为小写且不带扩展名"""
+    value = str(value).strip().replace('\\', '/')
+    directory, filename = os.path.split(value)
+    stem, ext = os.path.splitext(filename)
+    if ext.lower() not in SOUND_EXTENSIONS:
+        # 没有扩展名，或者文件名本身带点（例如 Mr.）
+        stem = filename
+    return os.path.basename(directory).lower(), stem.lower()
+
+
+class SoundIndex:
+    def __init__(self):
+        self._by_dir = {}  # (目录名, 文件名) -> 绝对路径
+        self._by_name = {}  # 文件名 -> 绝对路径，按目录优先级取第一个
+        self._paths = {}  # sound字段原值 -> 绝对路径或None
+        self.missing = []  # 找不到音频文件的sound字段
+        self.bank = None  # 打包的音频库（SoundBank），启动后在后台导出为文件
+        self._bank_keys = {}  # sound字段原值 -> 音频库中的键
+
+    @classmethod
+    def scan(cls, roots):
+        """扫描音频目录建立索引，不存在的目录会被跳过"""
+        index = cls()
+        for root in roots:
+            if not root or not os.path.isdir(root):
+                continue
+            dir_name = os.path.basename(os.path.normpath(root)).lower()
+            for entry in os.scandir(root):
+                stem, ext = os.path.splitext(entry.name)
+                if ext.lower() not in SOUND_EXTENSIONS or not entry.is_file():
+                    continue
+                path = os.path.abspath(entry.path)
+                index._by_dir.setdefault((dir_name, stem.lower()), path)
+                index._by_name.setdefault(stem.lower(), path)
+        return index
+
+    @classmethod
+    def from_manifest(cls, manifest_path, export_dir=None):
+        """从build_assets.py生成的资源清单建立索引，路径在构建时已经解析好，不需要扫描目录
+
+        清单中带有打包的音频库且给出了export_dir时，音频从音频库中取出导出到export_dir（应用启动后在后台
+        调用bank.export_all，后台还没有导出到的音频在第一次播放前导出）。
+        """
+        with open(manifest_path, encoding='utf-8') as f:
+            manifest = json.load(f)
+        base = os.path.dirname(os.path.abspath(manifest_path))
+        index = cls()
+        bank_path = manifest.get('sound_bank') and os.path.join(base, manifest['sound_bank'])
+        if bank_path and export_dir and os.path.exists(bank_path):
+            from sound_bank import SoundBank
+
+            index.bank = SoundBank(bank_path, export_dir)
+        for value, path in manifest.get('sounds', {}).items():
+            if index.bank is not None and path in index.bank:
+                index._bank_keys[value] = path
+                continue
+            path = os.path.normpath(os.path.join(base, path)) if path else None
+            index._paths[value] = path
+            if path:
+                index._by_name.setdefault(sound_key(path)[1], path)
+        index.missing = list(manifest.get('missing_sounds', []))
+        return index
+
+    def __len__(self):
+        return len(self._by_name)
+
+    def _lookup(self, value):
+        key = sound_key(value)
+        return self._by_dir.get(key) or self._by_name.get(key[1])
+
+    def add_words(self, words):
+        """为词库中的单词预先解析音频路径，返回本次新发现缺失的sound字段"""
+        missing = []
+        for word in words:
+            value = word.sound
+            if not value or value in self._paths:
+                continue
+            path = self._lookup(value)
+            self._paths[value] = path
+            if path is None:
+                missing.append(value)
+        self.missing.extend(missing)
+        return missing
+
+    def path_for(self, word):
+        """返回单词音频的绝对路径，没有音频时返回None"""
+        value = word.sound
+        try:
+            return self._paths[value]
+        except KeyError:
+            key = self._bank_keys.get(value)
+            if key is not None:
+                # 后台还没有导出到这个音频时在这里导出
+                path = self.bank.export(key)
+            else:
+                # 不在预先解析的词库中（例如词库在运行中更新），解析一次后记住
+                path = self._lookup(value) if value else None
+            self._paths[value] = path
+            return path
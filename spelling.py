@@ -0,0 +1,144 @@
+# 拼写纠错 - 手动输入答案时，找出所有词库中与输入最接近的单词，提示"您是不是要输入"
+#
+# 使用对称删除索引（SymSpell）：建立索引时为每个单词生成删去不超过max_distance个字母的所有变体，
+# 查询时同样生成输入的删除变体，编辑距离不超过max_distance的单词一定与输入有一个相同的变体。
+# 每次查询只需要几十次二分查找，再对少量候选单词计算精确的编辑距离，不需要像
+# difflib.get_close_matches那样与每个单词逐一比较（与BK树的对比见benchmarks/bench_spelling.py）。
+# 变体只以哈希值的形式保存在一个排好序的整数数组中，每个变体占8字节
+import bisect
+import collections
+from array import array
+
+# 建立索引时的最大编辑距离，查询时可以使用更小的距离
+MAX_DISTANCE = 2
+
+# 数组中每一项：高位为变体的哈希值，低位为单词序号
+_INDEX_BITS = 24
+_INDEX_MASK = (1 << _INDEX_BITS) - 1
+_HASH_MASK = (1 << (63 - _INDEX_BITS)) - 1
+
+
+def _deletes(word, max_distance):
+    """word本身以及删去不超过max_distance个字母得到的所有变体"""
+    variants = {word}
+    frontier = variants
+    for _ in range(max_distance):
+        frontier = {variant[:i] + variant[i + 1:] for variant in frontier for i in range(len(variant))}
+        variants |= frontier
+    return variants
+
+
+def _key(variant):
+    return (hash(variant) & _HASH_MASK) << _INDEX_BITS
+
+
+def _char_masks(pattern):
+    """pattern中每个字符出现位置的位图"""
+    masks = collections.defaultdict(int)
+    for i, char in enumerate(pattern):
+        masks[char] |= 1 << i
+    return masks
+
+
+def _distance(masks, length, text):
+    """pattern（由masks和length表示）与text之间的编辑距离（插入、删除、替换各算1），
+    位并行算法（Myers/Hyyrö），只需要按text的长度做若干次整数运算"""
+    if not length:
+        return len(text)
+    full = (1 << length) - 1
+    high = 1 << (length - 1)
+    pv, mv, score = full, 0, length
+    for char in text:
+        eq = masks.get(char, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | ~(xh | pv)
+        mh = pv & xh
+        if ph & high:
+            score += 1
+        elif mh & high:
+            score -= 1
+        ph = (ph << 1) | 1
+        pv = ((mh << 1) | ~(xv | ph)) & full
+        mv = ph & xv
+    return score
+
+
+def edit_distance(a, b):
+    """两个字符串之间的编辑距离"""
+    return _distance(_char_masks(a), len(a), b)
+
+
+def normalize(text):
+    """比较时忽略大小写和首尾空白"""
+    return text.strip().lower()
+
+
+class SpellingIndex:
+    """单词的拼写纠错索引，建立一次后只读，可以在后台线程中建立"""
+
+    def __init__(self, words, max_distance=MAX_DISTANCE):
+        self.max_distance = max_distance
+        # 相同拼写（忽略大小写）的单词只保留一个
+        by_key = {}
+        for word in words:
+            by_key.setdefault(normalize(word), word)
+        self._keys = sorted(key for key in by_key if key)
+        self.words = [by_key[key] for key in self._keys]
+        if len(self.words) > _INDEX_MASK + 1:
+            raise ValueError(f'单词太多: {len(self.words)}')
+        entries = [_key(variant) | position
+                   for position, key in enumerate(self._keys) for variant in _deletes(key, max_distance)]
+        entries.sort()
+        self._index = array('q', entries)
+
+    def __len__(self):
+        return len(self.words)
+
+    def __contains__(self, word):
+        key = normalize(word)
+        position = bisect.bisect_left(self._keys, key)
+        return position < len(self._keys) and self._keys[position] == key
+
+    @property
+    def nbytes(self):
+        """索引数组占用的内存"""
+        return self._index.itemsize * len(self._index)
+
+    def search(self, word, max_distance=None):
+        """编辑距离不超过max_distance的所有单词，返回[(距离, 单词)]，按距离和单词排序"""
+        limit = self.max_distance if max_distance is None else min(max_distance, self.max_distance)
+        query = normalize(word)
+        masks, length = _char_masks(query), len(query)
+        index, keys = self._index, self._keys
+        checked = set()
+        found = []
+        for variant in _deletes(query, limit):
+            key = _key(variant)
+            i = bisect.bisect_left(index, key)
+            # 哈希值相同的项相邻；哈希冲突的候选会在计算编辑距离时被排除
+            while i < len(index) and index[i] & ~_INDEX_MASK == key:
+                position = index[i] & _INDEX_MASK
+                i += 1
+                if position in checked:
+                    continue
+                checked.add(position)
+                candidate = keys[position]
+                if abs(len(candidate) - length) > limit:
+                    continue
+                distance = _distance(masks, length, candidate)
+                if distance <= limit:
+                    found.append((distance, self.words[position]))
+        found.sort()
+        return found
+
+    def suggest(self, word, limit=3, max_distance=None):
+        """与word最接近的最多limit个单词（不含拼写相同的单词）；
+        大多数拼写错误只差一个字母，先按距离1查找，不够时才扩大距离"""
+        limit_distance = self.max_distance if max_distance is None else min(max_distance, self.max_distance)
+        suggestions = []
+        for distance in range(1, limit_distance + 1):
+            suggestions = [candidate for found, candidate in self.search(word, distance) if found]
+            if len(suggestions) >= limit:
+                break
+        return suggestions[:limit]
@@ -0,0 +1,158 @@
+# SQLite词库 - 由build_assets.py --sqlite从所有工作簿生成，可选，与WordBank提供相同的读取接口
+#
+# 分类、单词和音节都建有索引：可以跨词库查询（例如所有包含音节er的单词）、只读取分类中的一段单词，
+# 分类的单词数直接从categories表读取，不需要加载单词。应用在后台线程中一次读取整个分类
+# （答题引擎开始时就需要全部单词来打乱顺序、建立复习队列和干扰音节池）
+import os
+import sqlite3
+import threading
+
+from wordbank import WordRecord, source_matches
+
+STORE_VERSION = 1
+
+SCHEMA = '''
+CREATE TABLE decks (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL UNIQUE,
+    size INTEGER,
+    mtime REAL,
+    sha1 TEXT
+);
+CREATE TABLE categories (
+    id INTEGER PRIMARY KEY,
+    deck_id INTEGER NOT NULL REFERENCES decks(id),
+    name TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    word_count INTEGER NOT NULL,
+    valid INTEGER NOT NULL
+);
+CREATE UNIQUE INDEX idx_categories_deck_name ON categories(deck_id, name);
+CREATE TABLE words (
+    id INTEGER PRIMARY KEY,
+    category_id INTEGER NOT NULL REFERENCES categories(id),
+    position INTEGER NOT NULL,
+    chinese TEXT NOT NULL,
+    word TEXT NOT NULL,
+    pronunciation TEXT NOT NULL,
+    syllables TEXT NOT NULL,
+    sound TEXT NOT NULL
+);
+CREATE INDEX idx_words_category ON words(category_id, position);
+CREATE TABLE word_syllables (
+    syllable TEXT NOT NULL,
+    word_id INTEGER NOT NULL REFERENCES words(id),
+    PRIMARY KEY (syllable, word_id)
+) WITHOUT ROWID;
+'''
+
+_WORD_COLUMNS = 'w.chinese, w.word, w.pronunciation, w.syllables, w.sound'
+
+
+def build_word_store(decks, db_path):
+    """生成SQLite词库，decks为[(源文件相对路径, 源文件指纹, [(工作表名, 行列表或None)])]"""
+    tmp_path = db_path + '.tmp'
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.executescript(SCHEMA)
+        for source, fingerprint, sheets in decks:
+            deck_id = conn.execute('INSERT INTO decks (source, size, mtime, sha1) VALUES (?, ?, ?, ?)',
+                                   (source, fingerprint['size'], fingerprint['mtime'], fingerprint['sha1'])).lastrowid
+            for position, (name, rows) in enumerate(sheets):
+                category_id = conn.execute(
+                    'INSERT INTO categories (deck_id, name, position, word_count, valid) VALUES (?, ?, ?, ?, ?)',
+                    (deck_id, name, position, len(rows or ()), rows is not None)).lastrowid
+                for word_position, row in enumerate(rows or ()):
+                    word_id = conn.execute(
+                        'INSERT INTO words (category_id, position, chinese, word, pronunciation, syllables, sound) '
+                        'VALUES (?, ?, ?, ?, ?, ?, ?)', (category_id, word_position, *row)).lastrowid
+                    conn.executemany('INSERT OR IGNORE INTO word_syllables (syllable, word_id) VALUES (?, ?)',
+                                     ((part, word_id) for part in WordRecord(*row).parts))
+        conn.execute(f'PRAGMA user_version = {STORE_VERSION}')
+        conn.commit()
+        conn.execute('VACUUM')
+    finally:
+        conn.close()
+    os.replace(tmp_path, db_path)
+
+
+class WordStore:
+    """只读打开SQLite词库中的一个工作簿，接口与WordBank相同（sheet_names、has_sheet、load_sheet）"""
+
+    def __init__(self, db_path, source):
+        self.db_path = db_path
+        self.source = source
+        # 分类在后台线程中加载，连接在线程间共用，用锁串行化
+        self._conn = sqlite3.connect(f'file:{db_path}?mode=ro', uri=True, check_same_thread=False)
+        self._lock = threading.Lock()
+        self.deck = None
+        self._categories = {}  # 工作表名 -> (分类id, 单词数, 是否有效)，按工作表顺序
+
+    @classmethod
+    def open(cls, db_path, source, xlsx_path=None):
+        """打开词库；文件不存在、版本不符、没有该工作簿或与xlsx不一致时返回None"""
+        if not db_path or not os.path.exists(db_path):
+            return None
+        store = cls(db_path, source)
+        try:
+            with store._lock:
+                if store._conn.execute('PRAGMA user_version').fetchone()[0] != STORE_VERSION:
+                    raise sqlite3.DatabaseError('版本不符')
+                row = store._conn.execute('SELECT id, size, mtime, sha1 FROM decks WHERE source = ?',
+                                          (source,)).fetchone()
+                if row is None:
+                    raise sqlite3.DatabaseError(f'没有工作簿 {source}')
+                store.deck = {'id': row[0], 'size': row[1], 'mtime': row[2], 'sha1': row[3]}
+                store._categories = {name: (category_id, count, bool(valid)) for category_id, name, count, valid in
+                                     store._conn.execute('SELECT id, name, word_count, valid FROM categories '
+                                                         'WHERE deck_id = ? ORDER BY position', (row[0],))}
+        except sqlite3.DatabaseError:
+            store.close()
+            return None
+        if xlsx_path and os.path.exists(xlsx_path) and not source_matches(store.deck, xlsx_path):
+            store.close()
+            return None
+        return store
+
+    @property
+    def source_sha1(self):
+        return self.deck['sha1']
+
+    @property
+    def sheet_names(self):
+        return list(self._categories)
+
+    def has_sheet(self, name):
+        return name in self._categories
+
+    def category_counts(self):
+        """每个分类的单词数，不需要读取单词"""
+        return {name: count for name, (_, count, valid) in self._categories.items() if valid}
+
+    def load_sheet(self, name, offset=0, limit=None):
+        """读取一个分类（可以分页），返回WordRecord列表；工作表缺少必要列时返回None"""
+        category_id, _, valid = self._categories[name]
+        if not valid:
+            return None
+        with self._lock:
+            rows = self._conn.execute(f'SELECT {_WORD_COLUMNS} FROM words w WHERE w.category_id = ? '
+                                      'ORDER BY w.position LIMIT ? OFFSET ?',
+                                      (category_id, -1 if limit is None else limit, offset)).fetchall()
+        return [WordRecord(*row) for row in rows]
+
+    def words_with_syllable(self, syllable, limit=None):
+        """所有工作簿中包含该音节的单词，返回[(工作簿, 分类, WordRecord)]"""
+        with self._lock:
+            rows = self._conn.execute(
+                f'SELECT d.source, c.name, {_WORD_COLUMNS} FROM word_syllables s '
+                'JOIN words w ON w.id = s.word_id '
+                'JOIN categories c ON c.id = w.category_id '
+                'JOIN decks d ON d.id = c.deck_id '
+                'WHERE s.syllable = ? ORDER BY d.id, c.position, w.position LIMIT ?',
+                (syllable, -1 if limit is None else limit)).fetchall()
+        return [(source, category, WordRecord(*row)) for source, category, *row in rows]
+
+    def close(self):
+        self._conn.close()
@@ -0,0 +1,281 @@
+# 进度同步 - 把每次答题的结果上传到班级的同步服务器（见sync_server.py），老师可以查看全班的进度
+#
+# 默认关闭，设置环境变量 ENGREM_SYNC_URL=http://服务器:8765 开启，ENGREM_SYNC_CLASS 为班级名称。
+# 界面线程只把事件放入队列；后台线程积累一批（或超过一定时间）后gzip压缩，用保持连接的HTTP连接
+# 一次上传，失败时按指数退避（带随机抖动）重试。每个事件带有唯一编号，重试造成的重复上传由服务器忽略。
+# 没有上传的事件在切到后台（只写入，不上传）和退出时写入应用数据目录的 sync_outbox.jsonl，下次启动时继续上传
+import gzip
+import http.client
+import json
+import os
+import queue
+import random
+import threading
+import time
+import urllib.parse
+import uuid
+
+import instrument
+from applog import logger, report_error
+
+ENV_URL = 'ENGREM_SYNC_URL'
+ENV_CLASS = 'ENGREM_SYNC_CLASS'
+
+EVENTS_PATH = '/v1/events'
+DEVICE_NAME = 'sync_device'
+OUTBOX_NAME = 'sync_outbox.jsonl'
+
+# 积累这么多个事件，或距离第一个未上传的事件超过这么多秒时上传一次
+BATCH_SIZE = 50
+FLUSH_INTERVAL = 10.0
+# 失败后的重试间隔：从INITIAL_BACKOFF开始每次加倍，最多MAX_BACKOFF秒
+INITIAL_BACKOFF = 1.0
+MAX_BACKOFF = 300.0
+REQUEST_TIMEOUT = 10.0
+# 离线时最多保留的事件数，超过时丢弃最早的事件
+OUTBOX_LIMIT = 5000
+
+_FLUSH = object()
+_STOP = object()
+
+
+class SyncError(Exception):
+    """上传失败；retry_after为服务器要求的等待秒数，retryable为False时这一批不再重试"""
+
+    def __init__(self, message, retryable=True, retry_after=None):
+        super().__init__(message)
+        self.retryable = retryable
+        self.retry_after = retry_after
+
+
+def load_device_id(directory):
+    """本设备的编号，第一次使用时生成并保存"""
+    path = os.path.join(directory, DEVICE_NAME)
+    try:
+        with open(path, encoding='utf-8') as f:
+            device_id = f.read().strip()
+        if device_id:
+            return device_id
+    except FileNotFoundError:
+        pass
+    device_id = uuid.uuid4().hex
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(device_id)
+    return device_id
+
+
+class SyncClient:
+    def __init__(self, url, device_id, classroom='', outbox_path=None, batch_size=BATCH_SIZE,
+                 flush_interval=FLUSH_INTERVAL, initial_backoff=INITIAL_BACKOFF, max_backoff=MAX_BACKOFF,
+                 timeout=REQUEST_TIMEOUT, rng=random):
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme not in ('http', 'https') or not parts.hostname:
+            raise ValueError(f'同步服务器地址无效: {url}')
+        self.url = url
+        self._scheme = parts.scheme
+        self._host = parts.hostname
+        self._port = parts.port
+        self._path = parts.path.rstrip('/') + EVENTS_PATH
+        self.device_id = device_id
+        self.classroom = classroom
+        self.outbox_path = outbox_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.rng = rng
+        self.stats = {'events': 0, 'batches': 0, 'retries': 0, 'dropped': 0}
+        self._queue = queue.Queue()
+        self._thread = None
+        self._connection = None
+        self._pending = []  # 还没有上传成功的事件，只在后台线程中访问
+
+    @classmethod
+    def from_env(cls, directory):
+        """按环境变量创建客户端，没有设置同步服务器时返回None"""
+        url = os.environ.get(ENV_URL, '').strip()
+        if not url:
+            return None
+        return cls(url, load_device_id(directory), os.environ.get(ENV_CLASS, ''),
+                   outbox_path=os.path.join(directory, OUTBOX_NAME))
+
+    @property
+    def pending(self):
+        """还没有上传成功的事件数（近似值，后台线程可能正在上传）"""
+        return len(self._pending) + self._queue.qsize()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='progress-sync', daemon=True)
+        self._thread.start()
+
+    def record_answer(self, word, category, quality, wrong_taps, hints, revealed, at=None):
+        """记录一次答对（在界面线程中调用，只放入队列）"""
+        self._queue.put({'id': uuid.uuid4().hex, 'w': word, 'c': category, 'q': quality, 'x': wrong_taps, 'h': hints,
+                         'r': revealed, 't': time.time() if at is None else at})
+
+    def flush(self):
+        """让后台线程把未上传的事件写入磁盘（切到后台时调用），不等待写入完成，也不上传；
+        上传仍按正常的批次和重试间隔进行，界面线程不会因为网络而卡住"""
+        if self._thread is not None:
+            self._queue.put(_FLUSH)
+
+    def close(self, timeout=3.0):
+        """尝试上传剩余事件，保存未上传的事件并结束后台线程"""
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self):
+        try:
+            self._load_outbox()
+            self._send_loop()
+        except Exception as e:
+            report_error('同步进度', e)
+
+    def _send_loop(self):
+        backoff = 0.0
+        retry_at = None  # 失败后下一次重试的时间
+        oldest = time.monotonic() if self._pending else None  # 最早的未上传事件进入队列的时间
+        while True:
+            now = time.monotonic()
+            if retry_at is not None:
+                wait = retry_at - now
+            elif self._pending:
+                wait = oldest + self.flush_interval - now
+            else:
+                wait = None
+            try:
+                item = self._queue.get(timeout=max(0.0, wait) if wait is not None else None)
+            except queue.Empty:
+                item = None
+
+            command = None
+            if isinstance(item, dict):
+                self._pending.append(item)
+                if oldest is None:
+                    oldest = time.monotonic()
+                if len(self._pending) > OUTBOX_LIMIT:
+                    self.stats['dropped'] += len(self._pending) - OUTBOX_LIMIT
+                    del self._pending[:len(self._pending) - OUTBOX_LIMIT]
+                if len(self._pending) < self.batch_size or retry_at is not None:
+                    continue
+            elif item is not None:
+                command = item
+                # 先保存到磁盘：服务器没有响应时，退出前等不到上传结束
+                self._save_outbox()
+                if command is _FLUSH:
+                    continue
+
+            now = time.monotonic()
+            due = retry_at is None or now >= retry_at or command is _STOP
+            if self._pending and due:
+                try:
+                    self._upload_pending()
+                except SyncError as e:
+                    self.stats['retries'] += 1
+                    backoff = min(self.max_backoff, backoff * 2 if backoff else self.initial_backoff)
+                    # 随机抖动，避免全班的设备在服务器恢复后同时重试
+                    delay = e.retry_after if e.retry_after is not None else self.rng.uniform(backoff / 2, backoff)
+                    retry_at = time.monotonic() + delay
+                    logger.warning('EngRem: 同步进度失败，%.0f 秒后重试: %s', delay, e)
+                else:
+                    backoff = 0.0
+                    retry_at = None
+                oldest = time.monotonic() if self._pending else None
+
+            if command is _STOP:
+                self._save_outbox()
+                self._close_connection()
+                return
+
+    def _upload_pending(self):
+        """按批上传所有未上传的事件，遇到失败时抛出SyncError（已上传的批次不会再传）"""
+        while self._pending:
+            batch = self._pending[:self.batch_size]
+            body = gzip.compress(json.dumps({
+                'device': self.device_id,
+                'class': self.classroom,
+                'events': batch
+            }, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+            try:
+                self._post(body)
+            except SyncError as e:
+                if e.retryable:
+                    raise
+                # 服务器拒绝的批次重试也不会成功
+                self.stats['dropped'] += len(batch)
+                report_error('同步进度', e)
+            else:
+                self.stats['events'] += len(batch)
+                self.stats['batches'] += 1
+            del self._pending[:len(batch)]
+
+    def _post(self, body):
+        started = time.perf_counter()
+        headers = {'Content-Type': 'application/json', 'Content-Encoding': 'gzip',
+                   'Content-Length': str(len(body))}
+        # 连接保持打开供下一批使用；服务器关闭了空闲连接时重新连接一次
+        for attempt in range(2):
+            connection = self._get_connection()
+            try:
+                connection.request('POST', self._path, body, headers)
+                response = connection.getresponse()
+                response.read()
+                break
+            except (http.client.HTTPException, OSError) as e:
+                self._close_connection()
+                if attempt:
+                    raise SyncError(str(e)) from e
+        if response.will_close:
+            self._close_connection()
+        if instrument.ENABLED:
+            instrument.record('sync_upload', (time.perf_counter() - started) * 1000)
+
+        if 200 <= response.status < 300:
+            return
+        retry_after = response.getheader('Retry-After')
+        message = f'服务器返回 {response.status} {response.reason}'
+        if response.status in (408, 429) or response.status >= 500:
+            raise SyncError(message, retry_after=float(retry_after) if retry_after and retry_after.isdigit() else None)
+        raise SyncError(message, retryable=False)
+
+    def _get_connection(self):
+        if self._connection is None:
+            connection_class = http.client.HTTPSConnection if self._scheme == 'https' else http.client.HTTPConnection
+            self._connection = connection_class(self._host, self._port, timeout=self.timeout)
+        return self._connection
+
+    def _close_connection(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def _load_outbox(self):
+        if not self.outbox_path:
+            return
+        try:
+            with open(self.outbox_path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        self._pending.append(json.loads(line))
+                    except ValueError:
+                        break
+        except FileNotFoundError:
+            return
+        logger.info('EngRem: 读取上次未同步的进度: %d 条', len(self._pending))
+
+    def _save_outbox(self):
+        if not self.outbox_path:
+            return
+        if not self._pending:
+            if os.path.exists(self.outbox_path):
+                os.remove(self.outbox_path)
+            return
+        tmp_path = self.outbox_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.writelines(json.dumps(event, ensure_ascii=False, separators=(',', ':')) + '\n'
+                         for event in self._pending)
+        os.replace(tmp_path, self.outbox_path)
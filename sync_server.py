@@ -0,0 +1,215 @@
+# 进度同步服务器（参考实现）- 接收sync_client.py上传的答题事件，保存到SQLite，供老师查看全班进度
+#
+# 用法（在项目根目录）: python sync_server.py [--host 0.0.0.0] [--port 8765] [--db sync.db]
+# 在教室的电脑上运行，设备上设置 ENGREM_SYNC_URL=http://电脑的地址:8765 即可上传。
+#   POST /v1/events              上传一批事件（JSON，可以gzip压缩），按(设备, 事件编号)去重
+#   GET  /v1/progress?class=班级  每台设备的答题数、一次答对数、平均回忆质量和最后上传时间
+#   GET  /v1/health              健康检查
+# 只使用标准库；每个连接一个线程，支持HTTP/1.1保持连接，SQLite写入用锁串行化
+import argparse
+import gzip
+import io
+import json
+import sqlite3
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_PORT = 8765
+
+# 单个请求的大小上限（压缩后和解压后）以及每批的事件数上限
+MAX_BODY = 1024 * 1024
+MAX_DECODED = 8 * 1024 * 1024
+MAX_EVENTS = 1000
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS events (
+    device TEXT NOT NULL,
+    id TEXT NOT NULL,
+    class TEXT NOT NULL,
+    word TEXT NOT NULL,
+    category TEXT,
+    quality INTEGER NOT NULL,
+    wrong_taps INTEGER NOT NULL,
+    hints INTEGER NOT NULL,
+    revealed INTEGER NOT NULL,
+    at REAL NOT NULL,
+    received REAL NOT NULL,
+    PRIMARY KEY (device, id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_events_class ON events(class, device);
+'''
+
+PROGRESS_QUERY = '''
+SELECT device, COUNT(*), SUM(quality = 5), AVG(quality), COUNT(DISTINCT word), MAX(at)
+FROM events WHERE class = ? GROUP BY device ORDER BY device
+'''
+
+
+class BadRequest(Exception):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def _event_row(device, classroom, event, received):
+    """校验一个事件，返回要插入的行"""
+    if not isinstance(event, dict):
+        raise BadRequest('事件必须是对象')
+    try:
+        return (device, str(event['id']), classroom, str(event['w']), event.get('c'), int(event['q']),
+                int(event.get('x', 0)), int(event.get('h', 0)), int(bool(event.get('r'))), float(event['t']),
+                received)
+    except (KeyError, TypeError, ValueError) as e:
+        raise BadRequest(f'事件格式错误: {e}') from e
+
+
+class ProgressStore:
+    """保存事件的SQLite数据库，所有请求线程共用一个连接"""
+
+    def __init__(self, db_path):
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode = WAL')
+        self._conn.execute('PRAGMA synchronous = NORMAL')
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def add_events(self, device, classroom, events):
+        """保存一批事件，返回新增的事件数（重复上传的事件被忽略）"""
+        received = time.time()
+        rows = [_event_row(device, classroom, event, received) for event in events]
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.executemany('INSERT OR IGNORE INTO events VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', rows)
+            self._conn.commit()
+            return self._conn.total_changes - before
+
+    def progress(self, classroom):
+        with self._lock:
+            rows = self._conn.execute(PROGRESS_QUERY, (classroom,)).fetchall()
+        return [{'device': device, 'answers': answers, 'first_try': first_try, 'mean_quality': round(quality, 2),
+                 'words': words, 'last_seen': last_seen}
+                for device, answers, first_try, quality, words, last_seen in rows]
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM events').fetchone()[0]
+
+    def close(self):
+        self._conn.close()
+
+
+class SyncRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # 保持连接，设备每次上传不需要重新建立连接
+    server_version = 'EngRemSync/1'
+
+    def do_GET(self):
+        url = urllib.parse.urlsplit(self.path)
+        if url.path == '/v1/health':
+            self._send_json(200, {'ok': True})
+        elif url.path == '/v1/progress':
+            classroom = urllib.parse.parse_qs(url.query).get('class', [''])[0]
+            self._send_json(200, {'class': classroom, 'devices': self.server.store.progress(classroom)})
+        else:
+            self._send_json(404, {'error': '找不到'})
+
+    def do_POST(self):
+        if urllib.parse.urlsplit(self.path).path != '/v1/events':
+            self._discard_body()
+            self._send_json(404, {'error': '找不到'})
+            return
+        try:
+            payload = self._read_json()
+            device = payload.get('device')
+            events = payload.get('events')
+            if not isinstance(device, str) or not device or len(device) > 64:
+                raise BadRequest('缺少设备编号')
+            if not isinstance(events, list) or len(events) > MAX_EVENTS:
+                raise BadRequest(f'events必须是不超过 {MAX_EVENTS} 个事件的列表')
+            accepted = self.server.store.add_events(device, str(payload.get('class') or ''), events)
+        except BadRequest as e:
+            self._send_json(e.status, {'error': str(e)})
+            return
+        self._send_json(200, {'accepted': accepted, 'duplicates': len(events) - accepted})
+
+    def _read_json(self):
+        try:
+            length = int(self.headers.get('Content-Length', ''))
+        except ValueError:
+            # 不知道请求体有多长，无法跳过它读取下一个请求
+            self.close_connection = True
+            raise BadRequest('缺少Content-Length', 411) from None
+        if length > MAX_BODY:
+            self.close_connection = True
+            raise BadRequest('请求太大', 413)
+        body = self.rfile.read(length)
+        if self.headers.get('Content-Encoding', '').lower() == 'gzip':
+            try:
+                body = gzip.GzipFile(fileobj=io.BytesIO(body)).read(MAX_DECODED + 1)
+            except (OSError, EOFError) as e:
+                raise BadRequest(f'无法解压: {e}') from e
+            if len(body) > MAX_DECODED:
+                raise BadRequest('请求太大', 413)
+        try:
+            payload = json.loads(body)
+        except ValueError as e:
+            raise BadRequest(f'JSON格式错误: {e}') from e
+        if not isinstance(payload, dict):
+            raise BadRequest('请求必须是JSON对象')
+        return payload
+
+    def _discard_body(self):
+        length = self.headers.get('Content-Length')
+        if length and length.isdigit() and int(length) <= MAX_BODY:
+            self.rfile.read(int(length))
+        else:
+            self.close_connection = True
+
+    def _send_json(self, status, data):
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class SyncServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256  # 全班的设备可能同时连接
+
+    def __init__(self, address, db_path, verbose=False, handler=SyncRequestHandler):
+        self.store = ProgressStore(db_path)
+        self.verbose = verbose
+        super().__init__(address, handler)
+
+    def server_close(self):
+        super().server_close()
+        self.store.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='进度同步服务器')
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--db', default='sync.db', help='保存事件的SQLite数据库')
+    parser.add_argument('--verbose', action='store_true', help='输出每个请求')
+    args = parser.parse_args(argv)
+
+    server = SyncServer((args.host, args.port), args.db, verbose=args.verbose)
+    print(f'进度同步服务器: http://{args.host}:{server.server_address[1]}（数据库 {args.db}）')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+# 界面图片 - build_assets.py --atlas把data/image中的图片按屏幕密度缩放后打包为kivy图集，
+# 启动时按Metrics.density选择一个图集，所有图标共用一张纹理
+#
+# 每个密度一个图集（ui-mdpi、ui-hdpi……），选择不小于屏幕密度的最小档位，避免放大后模糊；
+# 没有图集或图集中没有该图片时使用data/image中的原图
+import functools
+import json
+import os
+
+from applog import logger
+
+# 原图所在目录
+IMAGE_DIR = 'data/image'
+# 图集输出目录和文件名前缀
+ATLAS_DIR = 'data_four/images'
+ATLAS_NAME = 'ui'
+
+# 密度档位（与安卓的划分相同）：名称 -> 相对于160dpi的缩放倍数
+DENSITY_BUCKETS = (
+    ('mdpi', 1.0),
+    ('hdpi', 1.5),
+    ('xhdpi', 2.0),
+    ('xxhdpi', 3.0),
+)
+# 原图是按该密度绘制的，更低的档位按比例缩小
+SOURCE_DENSITY = 3.0
+
+
+def pick_buckets(density):
+    """按优先级排列的档位：先是不小于density的档位（从小到大），再是更小的档位（从大到小）"""
+    larger = [name for name, scale in DENSITY_BUCKETS if scale >= density]
+    smaller = [name for name, scale in reversed(DENSITY_BUCKETS) if scale < density]
+    return larger + smaller
+
+
+@functools.lru_cache(maxsize=None)
+def _atlas():
+    """返回(图集路径（不含扩展名）, 图片名集合)，没有可用的图集时返回(None, 空集合)"""
+    from kivy.metrics import Metrics
+    from kivy.resources import resource_find
+
+    for bucket in pick_buckets(Metrics.density):
+        base = f'{ATLAS_DIR}/{ATLAS_NAME}-{bucket}'
+        path = resource_find(base + '.atlas')
+        if not path:
+            continue
+        try:
+            with open(path, encoding='utf-8') as f:
+                names = {name for ids in json.load(f).values() for name in ids}
+        except (OSError, ValueError) as e:
+            logger.warning('EngRem: 无法读取图集 %s: %s', path, e)
+            continue
+        logger.info('EngRem: 屏幕密度 %.2f，使用图集 %s', Metrics.density, base)
+        return base, frozenset(names)
+    return None, frozenset()
+
+
+def image_source(name):
+    """图片的source，用于Image.source或Button.background_normal等；name为不含扩展名的文件名"""
+    base, names = _atlas()
+    if name in names:
+        return f'atlas://{base}/{name}'
+    return os.path.join(IMAGE_DIR, name + '.png').replace(os.sep, '/')
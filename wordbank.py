@@ -0,0 +1,219 @@
+# 编译后的词库缓存 - 避免每次选择分类都重新用pandas解析xlsx
+#
+# 文件格式：
+#   第一行是JSON头部（版本、源文件指纹、列名、每个工作表的偏移和长度），以换行结束
+#   之后依次是每个工作表的JSON数组（每行一个列表，按COLUMNS顺序），偏移相对于头部之后
+# 加载某个分类时只需seek到对应偏移读取一段JSON，不需要读取整个文件
+import hashlib
+import json
+import os
+import sys
+
+from applog import logger
+
+BANK_VERSION = 1
+
+# 词库中保存的列，顺序即每行数据的顺序
+COLUMNS = ('chinese', 'word', 'pronunciation', 'syllables', 'sound')
+
+
+class WordRecord:
+    """一个单词的紧凑记录：使用__slots__而不是字典，字符串都经过驻留，音节在加载时只拆分一次"""
+    __slots__ = ('chinese', 'word', 'pronunciation', 'syllables', 'sound', 'parts')
+
+    def __init__(self, chinese, word, pronunciation, syllables, sound):
+        intern = sys.intern
+        self.chinese = intern(chinese)
+        self.word = intern(word)
+        self.pronunciation = intern(pronunciation)
+        self.syllables = intern(syllables)  # 音标
+        self.sound = intern(sound)
+        # pronunciation字段逗号分隔的音节，相同音节在所有单词间共用同一个字符串
+        self.parts = tuple(intern(part) for part in pronunciation.split(',')) if pronunciation else ()
+
+    def __repr__(self):
+        return f'WordRecord({self.word!r}, {self.chinese!r})'
+
+
+def file_sha1(path):
+    """计算文件的sha1，用于在修改时间不可靠时判断源文件是否变化"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def file_fingerprint(path):
+    stat = os.stat(path)
+    return {
+        'size': stat.st_size,
+        'mtime': stat.st_mtime,
+        'sha1': file_sha1(path)
+    }
+
+
+def _cell_text(value):
+    # 空单元格在pandas中是NaN，统一转换为空字符串
+    if value is None or value != value:
+        return ''
+    return str(value).strip()
+
+
+def read_workbook_sheets(xlsx_path):
+    """读取工作簿中所有工作表，返回[(工作表名, 行列表或None)]，缺少必要列的工作表行列表为None"""
+    import xlsx_reader
+
+    sheets = []
+    for name, header, records in xlsx_reader.iter_sheet_records(xlsx_path):
+        if not all(col in header for col in COLUMNS):
+            sheets.append((name, None))
+            continue
+        rows = [[_cell_text(record.get(col)) for col in COLUMNS] for record in records]
+        sheets.append((name, rows))
+    return sheets
+
+
+def read_workbook_sheets_pandas(xlsx_path):
+    """与read_workbook_sheets相同，但使用pandas读取；只在离线构建时使用"""
+    import pandas as pd
+
+    sheets = []
+    xl = pd.ExcelFile(xlsx_path)
+    for name in xl.sheet_names:
+        df = xl.parse(name)
+        if not all(col in df.columns for col in COLUMNS):
+            sheets.append((name, None))
+            continue
+        rows = [[_cell_text(record.get(col)) for col in COLUMNS] for record in df.to_dict('records')]
+        sheets.append((name, rows))
+    return sheets
+
+
+def compile_workbook(xlsx_path, bank_path, reader=read_workbook_sheets):
+    """把xlsx编译为词库文件，返回写入的头部信息"""
+    header = {
+        'version': BANK_VERSION,
+        'source': file_fingerprint(xlsx_path),
+        'columns': list(COLUMNS),
+        'sheets': []
+    }
+
+    body = []
+    offset = 0
+    for name, rows in reader(xlsx_path):
+        if rows is None:
+            header['sheets'].append({'name': name, 'offset': 0, 'length': 0, 'count': 0, 'valid': False})
+            continue
+        data = json.dumps(rows, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        header['sheets'].append({'name': name, 'offset': offset, 'length': len(data), 'count': len(rows), 'valid': True})
+        body.append(data)
+        offset += len(data)
+
+    # 先写临时文件再替换，避免中途退出留下损坏的词库
+    bank_dir = os.path.dirname(bank_path)
+    if bank_dir:
+        os.makedirs(bank_dir, exist_ok=True)
+    tmp_path = bank_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(json.dumps(header, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+        f.write(b'\n')
+        for data in body:
+            f.write(data)
+    os.replace(tmp_path, bank_path)
+    return header
+
+
+def read_header(bank_path):
+    """读取词库头部，返回(头部, 数据起始位置)；文件不存在或已损坏时返回(None, 0)"""
+    try:
+        with open(bank_path, 'rb') as f:
+            line = f.readline()
+            return json.loads(line.decode('utf-8')), len(line)
+    except (OSError, ValueError):
+        return None, 0
+
+
+def is_fresh(header, xlsx_path):
+    """判断词库是否与源文件一致"""
+    if not header or header.get('version') != BANK_VERSION:
+        return False
+    if not os.path.exists(xlsx_path):
+        # 安装包中可以只带编译好的词库，不带xlsx
+        return True
+    return source_matches(header.get('source', {}), xlsx_path)
+
+
+def source_matches(source, xlsx_path):
+    """比较记录的源文件指纹与xlsx：先比较大小和修改时间，不一致时再比较sha1"""
+    stat = os.stat(xlsx_path)
+    if source.get('size') == stat.st_size and source.get('mtime') == stat.st_mtime:
+        return True
+    # 修改时间变化（例如安卓解压资源）但内容未变时仍然可以使用
+    return source.get('size') == stat.st_size and source.get('sha1') == file_sha1(xlsx_path)
+
+
+class WordBank:
+    """按工作表读取编译后的词库，源xlsx变化时自动重新编译
+
+    bundled_path是随安装包发布的预编译词库（由离线构建生成，只读），与源文件一致时直接使用；
+    否则在bank_path（应用数据目录）中用标准库读取器重新编译。
+    """
+
+    def __init__(self, xlsx_path, bank_path, bundled_path=None):
+        self.xlsx_path = xlsx_path
+        self.bank_path = bank_path
+        self.bundled_path = bundled_path
+        self.path = None
+        self.header = None
+        self.data_start = 0
+        self._sheets = {}
+
+    def open(self):
+        for path in (self.bundled_path, self.bank_path):
+            if not path:
+                continue
+            header, data_start = read_header(path)
+            if is_fresh(header, self.xlsx_path):
+                break
+        else:
+            path = self.bank_path
+            logger.info('EngRem: 词库已过期，重新编译: %s -> %s', self.xlsx_path, path)
+            compile_workbook(self.xlsx_path, path)
+            header, data_start = read_header(path)
+        self.path = path
+        self.header = header
+        self.data_start = data_start
+        self._sheets = {sheet['name']: sheet for sheet in header['sheets']}
+        return self
+
+    @property
+    def sheet_names(self):
+        return [sheet['name'] for sheet in self.header['sheets']]
+
+    @property
+    def source_sha1(self):
+        return self.header['source'].get('sha1')
+
+    def has_sheet(self, name):
+        return name in self._sheets
+
+    def category_counts(self):
+        """每个分类的单词数，直接从头部读取"""
+        return {sheet['name']: sheet['count'] for sheet in self.header['sheets'] if sheet['valid']}
+
+    def load_sheet(self, name):
+        """读取一个工作表，返回WordRecord列表；工作表缺少必要列时返回None"""
+        sheet = self._sheets[name]
+        if not sheet['valid']:
+            return None
+        with open(self.path, 'rb') as f:
+            f.seek(self.data_start + sheet['offset'])
+            rows = json.loads(f.read(sheet['length']).decode('utf-8'))
+        columns = self.header['columns']
+        if tuple(columns) != COLUMNS:
+            # 旧版本词库的列顺序不同，按列名重新排列
+            positions = [columns.index(col) for col in COLUMNS]
+            rows = [[row[i] for i in positions] for row in rows]
+        return [WordRecord(*row) for row in rows]
+
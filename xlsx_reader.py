@@ -0,0 +1,122 @@
+# 精简的xlsx读取器 - 只用标准库（zipfile + ElementTree），运行时不再需要pandas/openpyxl
+#
+# 只支持本项目词库需要的部分：工作表名称、共享字符串、内联字符串和数字单元格
+import posixpath
+import zipfile
+from xml.etree import ElementTree
+
+NS_MAIN = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+NS_REL = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+NS_PKG_REL = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+
+def _sheet_targets(archive):
+    """返回[(工作表名, 压缩包内路径)]，顺序与Excel中一致"""
+    rels = {}
+    with archive.open('xl/_rels/workbook.xml.rels') as f:
+        for _, elem in ElementTree.iterparse(f):
+            if elem.tag == NS_PKG_REL + 'Relationship':
+                target = elem.get('Target')
+                # Target可能是相对xl/的路径，也可能是以/开头的绝对路径
+                if target.startswith('/'):
+                    target = target[1:]
+                else:
+                    target = posixpath.normpath(posixpath.join('xl', target))
+                rels[elem.get('Id')] = target
+
+    sheets = []
+    with archive.open('xl/workbook.xml') as f:
+        for _, elem in ElementTree.iterparse(f):
+            if elem.tag == NS_MAIN + 'sheet':
+                sheets.append((elem.get('name'), rels.get(elem.get(NS_REL + 'id'))))
+    return sheets
+
+
+def _shared_strings(archive):
+    try:
+        f = archive.open('xl/sharedStrings.xml')
+    except KeyError:
+        return []
+    strings = []
+    with f:
+        for _, elem in ElementTree.iterparse(f):
+            if elem.tag == NS_MAIN + 'si':
+                # 富文本字符串由多个<r><t>组成，<rPh>是注音，不属于正文
+                parts = [t.text or '' for t in elem.findall(NS_MAIN + 't')]
+                parts.extend(t.text or '' for t in elem.findall(NS_MAIN + 'r/' + NS_MAIN + 't'))
+                strings.append(''.join(parts))
+                elem.clear()
+    return strings
+
+
+def _column_index(ref):
+    # 'C12' -> 2
+    index = 0
+    for char in ref:
+        if not char.isalpha():
+            break
+        index = index * 26 + (ord(char.upper()) - ord('A') + 1)
+    return index - 1
+
+
+def _number_text(value):
+    # 与pandas一致：整数值的数字不带小数点
+    try:
+        number = float(value)
+    except ValueError:
+        return value
+    if number.is_integer():
+        return str(int(number))
+    return str(number)
+
+
+def _cell_text(cell, shared):
+    cell_type = cell.get('t')
+    if cell_type == 'inlineStr':
+        return ''.join(t.text or '' for t in cell.iter(NS_MAIN + 't'))
+    value = cell.find(NS_MAIN + 'v')
+    if value is None or value.text is None:
+        return ''
+    if cell_type == 's':
+        return shared[int(value.text)]
+    if cell_type in ('str', 'e'):
+        return value.text
+    if cell_type == 'b':
+        return 'True' if value.text == '1' else 'False'
+    return _number_text(value.text)
+
+
+def iter_sheets(path):
+    """逐个工作表流式读取，产出(工作表名, 行列表)，每行是单元格文本的列表"""
+    with zipfile.ZipFile(path) as archive:
+        shared = _shared_strings(archive)
+        for name, target in _sheet_targets(archive):
+            rows = []
+            with archive.open(target) as f:
+                for _, elem in ElementTree.iterparse(f):
+                    if elem.tag != NS_MAIN + 'row':
+                        continue
+                    row = []
+                    for cell in elem.iter(NS_MAIN + 'c'):
+                        index = _column_index(cell.get('r', '')) if cell.get('r') else len(row)
+                        while len(row) < index:
+                            row.append('')
+                        row.append(_cell_text(cell, shared))
+                    rows.append(row)
+                    elem.clear()
+            yield name, rows
+
+
+def iter_sheet_records(path):
+    """以第一行作为表头，产出(工作表名, 表头, 记录字典列表)；完全空白的行会被跳过"""
+    for name, rows in iter_sheets(path):
+        if not rows:
+            yield name, [], []
+            continue
+        header = [text.strip() for text in rows[0]]
+        records = []
+        for row in rows[1:]:
+            if not any(text.strip() for text in row):
+                continue
+            records.append({column: (row[i] if i < len(row) else '') for i, column in enumerate(header) if column})
+        yield name, header, records